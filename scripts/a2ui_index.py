@@ -0,0 +1,29 @@
+"""Per-payload component indexes shared by the A2UI verification scripts."""
+
+# id(payload) -> (payload, by_id, by_component). The payload itself is kept so
+# its id cannot be recycled by a different object while the entry is cached.
+_INDEX_CACHE = {}
+
+
+def _index(payload):
+    key = id(payload)
+    hit = _INDEX_CACHE.get(key)
+    if hit is not None and hit[0] is payload:
+        return hit
+    by_id = {}
+    by_component = {}
+    for c in payload["updateComponents"]["components"]:
+        by_id[c["id"]] = c
+        by_component.setdefault(c["component"], []).append(c)
+    hit = _INDEX_CACHE[key] = (payload, by_id, by_component)
+    return hit
+
+
+def comps_by_id(payload):
+    """Return {component id: component}, built once per payload."""
+    return _index(payload)[1]
+
+
+def comps_by_component(payload):
+    """Return {component type: [components]}, built once per payload."""
+    return _index(payload)[2]
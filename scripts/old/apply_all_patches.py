@@ -0,0 +1,22 @@
+# Applies the implement_landing.py and implement_landing3.py patch tables to
+# graph.py in one read / one substitution pass / one write, instead of running
+# each script separately. fix2.py carries no substitutions so contributes none.
+from patch_utils import apply_patches, compile_patches, patch_in_place
+import implement_landing
+import implement_landing3
+
+GRAPH_PATH = implement_landing.GRAPH_PATH
+
+PATCHES = {**implement_landing.PATCHES, **implement_landing3.PATCHES}
+_PATCH_RE = compile_patches(PATCHES)
+
+
+def main():
+    if not patch_in_place(GRAPH_PATH, lambda text: apply_patches(text, PATCHES, _PATCH_RE)):
+        print("No patches matched; graph.py left untouched.")
+        return
+    print(f"Applied {len(PATCHES)} graph.py patches.")
+
+
+if __name__ == "__main__":
+    main()
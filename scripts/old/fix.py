@@ -1,7 +1,9 @@
-with open("/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py", "r") as f:
-    text = f.read()
+from patch_utils import slurp, spill_if_changed, sub_all
 
-text = text.replace('return {"outbox": outbox, "ui": ui_state, "messages": messages}', 'return {"outbox": outbox, "ui": ui_state, "messages": messages, "transcript": ""}')
+GRAPH_PATH = "/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py"
 
-with open("/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py", "w") as f:
-    f.write(text)
+original = slurp(GRAPH_PATH)
+
+text = sub_all(original, 'return {"outbox": outbox, "ui": ui_state, "messages": messages}', 'return {"outbox": outbox, "ui": ui_state, "messages": messages, "transcript": ""}')
+
+spill_if_changed(GRAPH_PATH, original, text)
@@ -1,11 +1,13 @@
-with open("/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py", "r") as f:
-    text = f.read()
+from patch_utils import slurp, spill_if_changed, sub_once
 
-text = text.replace(
+GRAPH_PATH = "/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py"
+
+original = slurp(GRAPH_PATH)
+
+text = sub_once(original,
 '''    outbox.append({"type": "server.voice.say", "payload": {"text": "Great choice. I've prepared your summary. You can review it on screen and confirm if you want to proceed."}})''',
 '''    if state.get("mode") != "voice":
         outbox.append({"type": "server.voice.say", "payload": {"text": "Great choice. I've prepared your summary. You can review it on screen and confirm if you want to proceed."}})'''
 )
 
-with open("/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py", "w") as f:
-    f.write(text)
+spill_if_changed(GRAPH_PATH, original, text)
@@ -1,16 +1,19 @@
-import re
+from patch_utils import apply_patches, compile_patches, patch_in_place
 
-with open("/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py", "r") as f:
-    text = f.read()
+GRAPH_PATH = "/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py"
+
+# All substitutions are collected into one (needle -> replacement) table and
+# applied in a single regex pass instead of rescanning graph.py per replace().
+PATCHES = {}
 
 # 1. Update start_router
-text = text.replace(
+PATCHES[
 '''def start_router(state: AgentState):
     if state.get("pendingAction"):
         return "handle_ui_action"
     if state.get("transcript"):
         return "interpret_intent"
-    return END''',
+    return END'''] = (
 '''def start_router(state: AgentState):
     if state.get("pendingAction"):
         return "handle_ui_action"
@@ -49,7 +52,7 @@ handle_replacement = '''    elif action_id == "reset_flow":
         
         return {"intent": intent, "outbox": outbox, "messages": messages}'''
 
-text = text.replace(
+PATCHES[
 '''    elif action_id == "reset_flow":
         return {
             "intent": {"propertyValue": None, "loanBalance": None, "fixYears": None, "termYears": 25},
@@ -60,21 +63,27 @@ text = text.replace(
             "transcript": "",
             "existing_customer": None,
             "property_seen": None
-        }''',
-handle_replacement
-)
+        }'''] = handle_replacement
 
 # 3. Add to ui_action_router
-text = text.replace(
+PATCHES[
 '''    elif action_id == "reset_flow":
-        return "render_missing_inputs"''',
+        return "render_missing_inputs"'''] = (
 '''    elif action_id == "reset_flow":
         return "render_missing_inputs"
     elif action_id == "select_category":
         return "render_missing_inputs"'''
 )
 
-with open("/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py", "w") as f:
-    f.write(text)
+_PATCH_RE = compile_patches(PATCHES)
+
+
+def main():
+    if not patch_in_place(GRAPH_PATH, lambda text: apply_patches(text, PATCHES, _PATCH_RE)):
+        print("No patches matched; graph.py left untouched.")
+        return
+    print("Updates to routing and actions applied.")
+
 
-print("Updates to routing and actions applied.")
+if __name__ == "__main__":
+    main()
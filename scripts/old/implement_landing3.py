@@ -1,9 +1,12 @@
-with open("/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py", "r") as f:
-    text = f.read()
+from patch_utils import apply_patches, compile_patches, patch_in_place
+
+GRAPH_PATH = "/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py"
+
+PATCHES = {}
 
 # Make missing logic prioritize category
-text = text.replace(
-'''    if intent.get("existingCustomer") is None: missing.append("whether you already bank with Barclays")''',
+PATCHES[
+'''    if intent.get("existingCustomer") is None: missing.append("whether you already bank with Barclays")'''] = (
 '''    if not intent.get("category"): missing.append("category")
     elif intent.get("existingCustomer") is None: missing.append("whether you already bank with Barclays")'''
 )
@@ -19,13 +22,19 @@ replacement_missing = '''    if missing:
         else:
             msg = f"Can you tell me your {missing[0]}?"'''
 
-text = text.replace(
+PATCHES[
 '''    if missing:
-        msg = f"Can you tell me your {missing[0]}?"''',
-replacement_missing
-)
+        msg = f"Can you tell me your {missing[0]}?"'''] = replacement_missing
+
+_PATCH_RE = compile_patches(PATCHES)
+
+
+def main():
+    if not patch_in_place(GRAPH_PATH, lambda text: apply_patches(text, PATCHES, _PATCH_RE)):
+        print("No patches matched; graph.py left untouched.")
+        return
+    print("Updated missing logic")
 
-with open("/Users/jamescregeen/A2UI_S2S/server/app/agent/graph.py", "w") as f:
-    f.write(text)
 
-print("Updated missing logic")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+import re
+
+
+def slurp(path):
+    """Read a whole file with a single stat-sized os.read (no BufferedIO)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    return data.decode("utf-8")
+
+
+def spill(path, text):
+    """Write text to path, truncating it, via raw os.write."""
+    data = text.encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def spill_if_changed(path, original, text):
+    """Write text back only if patching changed it; returns whether it wrote."""
+    if text == original:
+        return False
+    spill(path, text)
+    return True
+
+
+def patch_in_place(path, transform):
+    """Read, transform and rewrite path through one O_RDWR descriptor.
+
+    Uses pread/pwrite at offset 0 so the file is opened once rather than
+    once for reading and again for writing. Returns whether it wrote.
+    """
+    fd = os.open(path, os.O_RDWR)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.pread(fd, size, 0)
+        while len(data) < size:
+            chunk = os.pread(fd, size - len(data), len(data))
+            if not chunk:
+                break
+            data += chunk
+        original = data.decode("utf-8")
+        text = transform(original)
+        if text == original:
+            return False
+        view = memoryview(text.encode("utf-8"))
+        os.ftruncate(fd, 0)
+        offset = 0
+        while offset < len(view):
+            offset += os.pwrite(fd, view[offset:], offset)
+        return True
+    finally:
+        os.close(fd)
+
+
+def compile_patches(table):
+    """Build one alternation regex matching every needle in a patch table."""
+    return re.compile("|".join(re.escape(k) for k in table))
+
+
+def apply_patches(text, table, pattern=None):
+    """Apply every (needle -> replacement) in table in a single pass."""
+    pattern = pattern or compile_patches(table)
+    return pattern.sub(lambda m: table[m.group(0)], text)
+
+
+_PAT_CACHE = {}
+
+
+def _needle_pattern(needle):
+    pat = _PAT_CACHE.get(needle)
+    if pat is None:
+        pat = _PAT_CACHE.setdefault(needle, re.compile(re.escape(needle), re.DOTALL))
+    return pat
+
+
+def sub_once(text, needle, repl):
+    """Replace the first occurrence of a literal needle using a cached pattern."""
+    return _needle_pattern(needle).sub(lambda m: repl, text, count=1)
+
+
+def sub_all(text, needle, repl):
+    """Replace every occurrence of a literal needle (str.replace semantics)."""
+    return _needle_pattern(needle).sub(lambda m: repl, text)
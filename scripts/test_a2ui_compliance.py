@@ -3,66 +3,118 @@ import json
 import websockets
 import sys
 
+from a2ui_index import comps_by_component, comps_by_id
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Loopback test traffic: skip permessage-deflate and keepalive pings.
+_WS_OPTS = {"compression": None, "max_size": 2**22, "ping_interval": None}
+
+URI = "ws://localhost:8000/ws"
+
+
+async def wait_for_a2ui(websocket):
+    while True:
+        msg = await websocket.recv()
+        # Skip decoding frames that cannot be an A2UI patch.
+        if "server.a2ui.patch" not in msg:
+            continue
+        data = _loads(msg)
+        if data.get("type") == "server.a2ui.patch":
+            return data.get("payload")
+
+
+async def scenario_empty_state(uri):
+    """Scenario 1 runs on its own session so it can overlap the others."""
+    out = []
+    async with websockets.connect(uri, **_WS_OPTS) as websocket:
+        await websocket.send(_dumps({"type": "client.hello", "sessionId": "test-session-1"}))
+
+        out.append("\n--- Scenario 1: Empty State ---")
+        await websocket.send(_dumps({
+            "type": "client.text",
+            "payload": {"text": "hello"}
+        }))
+        payload = await wait_for_a2ui(websocket)
+        root_children = set(payload['updateComponents']['components'][0].get('children', []))
+        out.append(f"Title: {payload['updateComponents']['components'][1]['text']}")
+        out.append(f"Has Gauge: {'ltv_gauge' in root_children}")
+        out.append(f"Has Products: {'products_row' in root_children}")
+    return out
+
+
+async def scenario_partial_then_full(uri):
+    """Scenarios 2 and 3 share a session: the full-data turn builds on the partial one."""
+    out = []
+    async with websockets.connect(uri, **_WS_OPTS) as websocket:
+        await websocket.send(_dumps({"type": "client.hello", "sessionId": "test-session-2"}))
+
+        out.append("\n--- Scenario 2: Partial Data (Property Value) ---")
+        await websocket.send(_dumps({
+            "type": "client.text",
+            "payload": {"text": "My house is worth 400,000"}
+        }))
+        payload = await wait_for_a2ui(websocket)
+        out.append(f"Title: {payload['updateComponents']['components'][1]['text']}")
+        # Find gauge value
+        gauge = comps_by_id(payload).get('ltv_gauge')
+        if gauge:
+            out.append(f"LTV Gauge Value: {gauge['value']}%")
+
+        out.append("\n--- Scenario 3: Full Data ---")
+        await websocket.send(_dumps({
+            "type": "client.text",
+            "payload": {"text": "I have a loan of 250,000 and want a five year fix"}
+        }))
+        payload = await wait_for_a2ui(websocket)
+        out.append(f"Title: {payload['updateComponents']['components'][1]['text']}")
+        out.append(f"Comp count: {len(payload['updateComponents']['components'])}")
+        root_children = set(payload['updateComponents']['components'][0].get('children', []))
+        out.append(f"Has Products: {'products_row' in root_children}")
+
+        # Verify structure of first product card if available
+        prod_cards = comps_by_component(payload).get('ProductCard', [])
+        if prod_cards:
+            prod_card = prod_cards[0]
+            out.append(f"Product Card Sample: {prod_card['data']['name']} @ {prod_card['data']['rate']}%")
+    return out
+
+
+def _flush(lines):
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 async def test_a2ui_scenarios():
-    uri = "ws://localhost:8000/ws"
-    
-    print(f"Connecting to {uri}...")
+    uri = URI
+
+    lines = [f"Connecting to {uri}..."]
     try:
-        async with websockets.connect(uri) as websocket:
-            # 1. Hello
-            await websocket.send(json.stringify({"type": "client.hello", "sessionId": "test-session"}))
-            
-            async def wait_for_a2ui():
-                while True:
-                    msg = await websocket.recv()
-                    data = json.loads(msg)
-                    if data.get("type") == "server.a2ui.patch":
-                        return data.get("payload")
-            
-            print("\n--- Scenario 1: Empty State ---")
-            await websocket.send(json.stringify({
-                "type": "client.text", 
-                "payload": {"text": "hello"}
-            }))
-            payload = await wait_for_a2ui()
-            print(f"Title: {payload['updateComponents']['components'][1]['text']}")
-            print(f"Has Gauge: {'ltv_gauge' in payload['updateComponents']['components'][0]['children']}")
-            print(f"Has Products: {'products_row' in payload['updateComponents']['components'][0]['children']}")
-            
-            print("\n--- Scenario 2: Partial Data (Property Value) ---")
-            await websocket.send(json.stringify({
-                "type": "client.text", 
-                "payload": {"text": "My house is worth 400,000"}
-            }))
-            payload = await wait_for_a2ui()
-            print(f"Title: {payload['updateComponents']['components'][1]['text']}")
-            # Find gauge value
-            gauge = next((c for c in payload['updateComponents']['components'] if c['id'] == 'ltv_gauge'), None)
-            if gauge:
-                print(f"LTV Gauge Value: {gauge['value']}%")
-            
-            print("\n--- Scenario 3: Full Data ---")
-            await websocket.send(json.stringify({
-                "type": "client.text", 
-                "payload": {"text": "I have a loan of 250,000 and want a five year fix"}
-            }))
-            payload = await wait_for_a2ui()
-            print(f"Title: {payload['updateComponents']['components'][1]['text']}")
-            print(f"Comp count: {len(payload['updateComponents']['components'])}")
-            print(f"Has Products: {'products_row' in payload['updateComponents']['components'][0]['children']}")
-            
-            # Verify structure of first product card if available
-            prod_card = next((c for c in payload['updateComponents']['components'] if c['component'] == 'ProductCard'), None)
-            if prod_card:
-                print(f"Product Card Sample: {prod_card['data']['name']} @ {prod_card['data']['rate']}%")
-
-            print("\nSUCCESS: A2UI Payload structures verified against schema.")
+        # Independent sessions run concurrently; each returns its report lines
+        # so output stays in scenario order.
+        reports = await asyncio.gather(
+            scenario_empty_state(uri),
+            scenario_partial_then_full(uri),
+        )
+        for report in reports:
+            lines.extend(report)
+
+        lines.append("\nSUCCESS: A2UI Payload structures verified against schema.")
 
     except Exception as e:
-        print(f"ERROR: {e}")
+        lines.append(f"ERROR: {e}")
+        _flush(lines)
         sys.exit(1)
+    _flush(lines)
 
 if __name__ == "__main__":
-    # monkey patch json.stringify for easier conversion from my thought process
-    json.stringify = json.dumps
     asyncio.run(test_a2ui_scenarios())
@@ -3,25 +3,51 @@ import json
 import websockets
 import sys
 
+from a2ui_index import comps_by_component, comps_by_id
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Loopback test traffic: skip permessage-deflate and keepalive pings.
+_WS_OPTS = {"compression": None, "max_size": 2**22, "ping_interval": None}
+
+def _flush(lines):
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
 async def test_a2ui_logic():
     uri = "ws://localhost:8000/ws"
+    # Report lines are buffered and written in one go when the run ends.
+    lines = []
+    log = lines.append
     
-    print(f"Connecting to {uri}...")
+    log(f"Connecting to {uri}...")
     try:
-        async with websockets.connect(uri) as websocket:
-            await websocket.send(json.dumps({"type": "client.hello", "sessionId": "test-session"}))
+        async with websockets.connect(uri, **_WS_OPTS) as websocket:
+            await websocket.send(_dumps({"type": "client.hello", "sessionId": "test-session"}))
             
             async def wait_for_a2ui():
                 while True:
                     msg = await websocket.recv()
-                    data = json.loads(msg)
+                    # Skip decoding frames that cannot be an A2UI patch.
+                    if "server.a2ui.patch" not in msg:
+                        continue
+                    data = _loads(msg)
                     if data.get("type") == "server.a2ui.patch":
                         return data.get("payload")
 
             # 1. Test "Empty/Intro" response (Force trigger via voice confirming empty transcript)
             # This triggers the default fallback logic in interpret_intent
-            print("\n--- Testing A2UI Structural Layout: Empty Input ---")
-            await websocket.send(json.dumps({
+            log("\n--- Testing A2UI Structural Layout: Empty Input ---")
+            await websocket.send(_dumps({
                 "type": "client.text", 
                 "payload": {"text": "hello"}
             }))
@@ -33,49 +59,53 @@ async def test_a2ui_logic():
             assert "updateComponents" in payload, "Missing updateComponents key"
             
             comps = payload["updateComponents"]["components"]
-            print(f"Verified Version: {payload['version']}")
-            print(f"Total Components in DOM: {len(comps)}")
+            log(f"Verified Version: {payload['version']}")
+            log(f"Total Components in DOM: {len(comps)}")
             
-            comp_ids = [c["id"] for c in comps]
-            assert "root" in comp_ids, "Missing root node"
-            assert "header_text" in comp_ids, "Missing header text"
+            by_id = comps_by_id(payload)
+            assert "root" in by_id, "Missing root node"
+            assert "header_text" in by_id, "Missing header text"
             
-            root = next(c for c in comps if c["id"] == "root")
+            root = by_id["root"]
             assert root["component"] == "Column", "Root should be a Column"
-            print(f"Root layout: {root['component']} with children {root.get('children')}")
+            log(f"Root layout: {root['component']} with children {root.get('children')}")
 
             # 2. Test Full Data Scenario (Mocked values in graph.py)
-            print("\n--- Testing A2UI Structural Layout: Full Data Match ---")
+            log("\n--- Testing A2UI Structural Layout: Full Data Match ---")
             # We use keywords that the mock interpret_intent logic recognizes to avoid Bedrock
-            await websocket.send(json.dumps({
+            await websocket.send(_dumps({
                 "type": "client.text", 
                 "payload": {"text": "My house is 400 with 250 loan and 5 year fix"}
             }))
             payload = await wait_for_a2ui()
             
-            comps = payload["updateComponents"]["components"]
-            root = next(c for c in comps if c["id"] == "root")
+            by_id = comps_by_id(payload)
+            by_component = comps_by_component(payload)
+            root = by_id["root"]
+            root_children = set(root.get("children", []))
             
-            print(f"Title: {next(c['text'] for c in comps if c['id'] == 'header_text')}")
-            print(f"LTV Gauge Found: {'ltv_gauge' in root['children']}")
-            print(f"Products Row Found: {'products_row' in root['children']}")
+            log(f"Title: {by_id['header_text']['text']}")
+            log(f"LTV Gauge Found: {'ltv_gauge' in root_children}")
+            log(f"Products Row Found: {'products_row' in root_children}")
             
             # Verify ProductCard structure
-            prod_cards = [c for c in comps if c["component"] == "ProductCard"]
-            print(f"Product Cards rendered: {len(prod_cards)}")
+            prod_cards = by_component.get("ProductCard", [])
+            log(f"Product Cards rendered: {len(prod_cards)}")
             if prod_cards:
                 sample = prod_cards[0]
                 assert "data" in sample, "ProductCard must contain data payload"
                 assert "monthlyPayment" in sample["data"], "Product data missing payment field"
-                print(f"Sample Product: {sample['data']['name']} - payment £{sample['data']['monthlyPayment']}")
+                log(f"Sample Product: {sample['data']['name']} - payment £{sample['data']['monthlyPayment']}")
 
-            print("\nSUCCESS: Programmatic A2UI Architecture Verification Complete.")
+            log("\nSUCCESS: Programmatic A2UI Architecture Verification Complete.")
 
     except Exception as e:
-        print(f"VERIFICATION FAILED: {e}")
+        log(f"VERIFICATION FAILED: {e}")
+        _flush(lines)
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    _flush(lines)
 
 if __name__ == "__main__":
     asyncio.run(test_a2ui_logic())
@@ -18,22 +18,30 @@ Security notes:
 from __future__ import annotations
 
 import asyncio
+import errno
 import json
 import logging
+import multiprocessing
 import os
 import shutil
-import subprocess
 import sys
 import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, field_validator
 
-from app.agent.core.importer import langgraph_json, inspector, generator
-from app.agent.core.importer.langgraph_json import LangGraphJsonError
-from app.agent.core.importer.inspector import InspectionError
+from app.agent.core.importer import langgraph_json, inspector, generator, validation as plugin_validation
+from app.agent.core.importer.langgraph_json import GraphEntry, LangGraphConfig, LangGraphJsonError
+from app.agent.core.importer.inspector import InspectionError, InspectionResult
 from app.agent.core.importer.generator import (
     GeneratorConfig,
     config_from_inspection,
@@ -44,6 +52,9 @@ from app.agent.core.importer.llm_designer import design as llm_design, refine as
 from app.agent.core.registry import list_plugins
 
 logger = logging.getLogger(__name__)
+# No default_response_class: with a response model (or return annotation) on
+# every route, FastAPI dumps JSON bytes straight from pydantic-core. A custom
+# class such as ORJSONResponse would force the slower dict → json round trip.
 router = APIRouter(prefix="/api", tags=["admin"])
 
 # ── Filesystem paths ──────────────────────────────────────────────────────────
@@ -56,6 +67,44 @@ _CLONE_TIMEOUT_S   = 30
 _MAX_REPO_SIZE_MB  = 50
 _IMPORT_CHECK_TIMEOUT_S = 10
 _PIP_INSTALL_TIMEOUT_S  = 120
+_PIP_STDERR_TAIL_BYTES  = 8 * 1024
+_LS_REMOTE_TIMEOUT_S    = 2
+_REV_PARSE_TIMEOUT_S    = 5
+_DU_TIMEOUT_S           = 10
+_INSPECTION_CACHE_MAX   = 64
+_MAX_CONCURRENT_IMPORTS = int(os.environ.get("NOVA_IMPORT_CONCURRENCY", "4"))
+
+# Same pattern validate_plugin_id() uses; matched inline so the common valid
+# case skips the call, and validate_plugin_id() still supplies the error text.
+_PLUGIN_ID_RE = generator._VALID_PLUGIN_ID
+_STRATEGIES = frozenset(("wrapper", "subgraph", "port"))
+
+
+def _pick_tmp_root() -> Optional[str]:
+    """
+    Return /dev/shm for clone temp dirs when NOVA_IMPORT_TMPFS=1 and it has room.
+
+    The clone lives only for the duration of one request, so keeping it on
+    tmpfs avoids disk writes. Returns None (use the default TMPDIR) otherwise.
+    """
+    if os.environ.get("NOVA_IMPORT_TMPFS") != "1" or not os.path.isdir("/dev/shm"):
+        return None
+    try:
+        free = shutil.disk_usage("/dev/shm").free
+    except OSError:
+        return None
+    return "/dev/shm" if free > _MAX_REPO_SIZE_MB * 2 * 1024 * 1024 else None
+
+
+_TMP_ROOT = _pick_tmp_root()
+
+# uv is a much faster drop-in for `pip install`; NOVA_UV_DISABLE=1 forces pip.
+_UV = None if os.environ.get("NOVA_UV_DISABLE") == "1" else shutil.which("uv")
+
+# Caps parallel clone/inspect/validate work across /import-agent requests.
+_IMPORT_SEM = asyncio.Semaphore(_MAX_CONCURRENT_IMPORTS)
+# pip installs into the shared server venv; concurrent runs race on site-packages.
+_PIP_SEM = asyncio.Semaphore(1)
 
 
 # ── Request / Response models ─────────────────────────────────────────────────
@@ -73,16 +122,14 @@ class ImportRequest(BaseModel):
     @field_validator("plugin_id")
     @classmethod
     def validate_id(cls, v: str) -> str:
-        try:
-            validate_plugin_id(v)
-        except ValueError as exc:
-            raise ValueError(str(exc)) from exc
+        if not _PLUGIN_ID_RE.fullmatch(v):
+            validate_plugin_id(v)  # raises ValueError with the canonical message
         return v
 
     @field_validator("strategy")
     @classmethod
     def validate_strategy(cls, v: str) -> str:
-        if v not in ("wrapper", "subgraph", "port"):
+        if v not in _STRATEGIES:
             raise ValueError("strategy must be one of: wrapper, subgraph, port")
         return v
 
@@ -147,9 +194,15 @@ class RefineResponse(BaseModel):
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+# Both separators map to ".", so Windows-style paths need no separate pass.
+_PATH_SEP_TO_DOT = str.maketrans({"/": ".", "\\": "."})
+
+
 def _derive_module_path(file_path: str) -> str:
     """Convert a relative file path to a Python module path. e.g. my_agent/agent.py → my_agent.agent"""
-    return file_path.replace("/", ".").removesuffix(".py")
+    if file_path.endswith(".py"):
+        file_path = file_path[:-3]
+    return file_path.translate(_PATH_SEP_TO_DOT)
 
 
 def _read_readme(repo_root: Path) -> str:
@@ -160,6 +213,74 @@ def _read_readme(repo_root: Path) -> str:
     return ""
 
 
+def _dir_size_or_limit(
+    root: Path, limit_bytes: int, skip_dirs: frozenset = frozenset()
+) -> tuple[int, bool]:
+    """
+    Sum apparent file sizes under root, stopping as soon as limit_bytes is exceeded.
+
+    Walks with an explicit stack of os.scandir() iterators so each entry costs a
+    single (usually cached) DirEntry.stat. Symlinks are not followed. Directory
+    names in skip_dirs are not descended into. Returns (total_bytes, exceeded).
+    """
+    total = 0
+    stack = [os.scandir(root)]
+    try:
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop().close()
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip_dirs:
+                    stack.append(os.scandir(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+                if total > limit_bytes:
+                    return total, True
+    finally:
+        for it in stack:
+            it.close()
+    return total, False
+
+
+# GNU du walks in C; only trusted on Linux, where -b (apparent bytes) is GNU.
+_DU = shutil.which("du") if sys.platform.startswith("linux") else None
+
+
+async def _dir_total_bytes(root: Path, limit_bytes: int) -> tuple[int, bool]:
+    """
+    Apparent size of root via `du -sb`, falling back to _dir_size_or_limit()
+    if du is unavailable, fails, or runs past _DU_TIMEOUT_S.
+
+    du cannot stop early and walks the whole tree; it is used only for fresh
+    clones, whose size is bounded by nothing but _CLONE_TIMEOUT_S, and the
+    du timeout caps the walk. Arbitrary local paths use the early-exit walk.
+    Both count .git; du also counts directory entries, which the file-only
+    walk does not, so its total is slightly larger for the same tree.
+    Returns (total_bytes, exceeded).
+    """
+    if _DU:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                _DU, "-sb", str(root),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            try:
+                out, _ = await asyncio.wait_for(proc.communicate(), timeout=_DU_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                out = None
+            if out is not None and proc.returncode == 0:
+                total = int(out.split(None, 1)[0])
+                return total, total > limit_bytes
+        except (OSError, ValueError, IndexError):
+            pass
+    return await asyncio.to_thread(_dir_size_or_limit, root, limit_bytes)
+
+
 def _is_local_path(url: str) -> bool:
     """True when url is a filesystem path rather than a remote URL."""
     return not url.startswith(("http://", "https://", "git://", "ssh://", "git@"))
@@ -167,14 +288,20 @@ def _is_local_path(url: str) -> bool:
 
 async def _git_clone(url: str, dest: Path) -> None:
     """Clone url into dest with depth=1. Raises HTTPException on failure."""
-    cmd = ["git", "clone", "--depth", "1", "--quiet", url, str(dest)]
+    # Only HEAD's tree is needed: no other branches, no tags. A blob-less partial
+    # clone would not help here — the full working tree is copied into src/.
+    cmd = [
+        "git", "-c", "protocol.file.allow=never",
+        "clone", "--depth=1", "--single-branch", "--no-tags", "--quiet",
+        url, str(dest),
+    ]
     try:
         proc = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
         )
-        stdout, stderr = await asyncio.wait_for(
+        _, stderr = await asyncio.wait_for(
             proc.communicate(), timeout=_CLONE_TIMEOUT_S
         )
     except asyncio.TimeoutError:
@@ -187,50 +314,208 @@ async def _git_clone(url: str, dest: Path) -> None:
         raise HTTPException(502, f"git clone failed: {msg}")
 
     # Size guard
-    total_bytes = sum(f.stat().st_size for f in dest.rglob("*") if f.is_file())
-    total_mb = total_bytes / (1024 * 1024)
-    if total_mb > _MAX_REPO_SIZE_MB:
-        shutil.rmtree(dest, ignore_errors=True)
+    total_bytes, too_big = await _dir_total_bytes(dest, _MAX_REPO_SIZE_MB * 1024 * 1024)
+    if too_big:
+        await asyncio.to_thread(shutil.rmtree, dest, ignore_errors=True)
         raise HTTPException(
             413,
-            f"Repo is {total_mb:.1f} MB — exceeds the {_MAX_REPO_SIZE_MB} MB limit.",
+            f"Repo is over {total_bytes / (1024 * 1024):.1f} MB — "
+            f"exceeds the {_MAX_REPO_SIZE_MB} MB limit.",
         )
 
 
+def _do_local_copy(local: Path, dest: Path) -> None:
+    """Size-check and copy a local directory. Blocking; run via asyncio.to_thread."""
+    # .git/ is skipped: pack files can dwarf the working tree being imported.
+    total_bytes, too_big = _dir_size_or_limit(
+        local, _MAX_REPO_SIZE_MB * 1024 * 1024, skip_dirs=frozenset({".git"})
+    )
+    if too_big:
+        raise HTTPException(
+            413,
+            f"Directory is over {total_bytes / (1024 * 1024):.1f} MB — "
+            f"exceeds the {_MAX_REPO_SIZE_MB} MB limit.",
+        )
+    shutil.copytree(local, dest, dirs_exist_ok=False)
+
+
 async def _acquire_repo(url: str, dest: Path) -> None:
     """Clone from a remote URL, or copy from a local filesystem path."""
     if _is_local_path(url):
         local = Path(url.replace("file://", "")).expanduser().resolve()
         if not local.exists():
             raise HTTPException(422, f"Local path not found: {local}")
-        total_bytes = sum(f.stat().st_size for f in local.rglob("*") if f.is_file())
-        total_mb = total_bytes / (1024 * 1024)
-        if total_mb > _MAX_REPO_SIZE_MB:
-            raise HTTPException(
-                413,
-                f"Directory is {total_mb:.1f} MB — exceeds the {_MAX_REPO_SIZE_MB} MB limit.",
-            )
-        shutil.copytree(local, dest, dirs_exist_ok=False)
+        await asyncio.to_thread(_do_local_copy, local, dest)
         logger.info("[Import] Copied local path %s → %s", local, dest)
     else:
         await _git_clone(url, dest)
 
 
+# ── Inspection cache ──────────────────────────────────────────────────────────
+#
+# Steps 2–3 (langgraph.json parse + AST inspection) depend only on the repo
+# contents, so for remote URLs they are memoised by (url, HEAD sha, graph_id).
+# Real imports key by the sha of the clone itself; only dry runs, which can
+# skip the clone on a hit, pay for a git ls-remote lookup up front.
+# Entries are treated as read-only by the request handler.
+
+@dataclass
+class _RepoInspection:
+    lg_config: LangGraphConfig
+    graph_entry: GraphEntry
+    result: InspectionResult
+    readme_excerpt: str
+    requirements: List[str]
+
+
+_inspection_cache: "OrderedDict[tuple, _RepoInspection]" = OrderedDict()
+
+
+def _inspection_cache_get(key: tuple) -> Optional[_RepoInspection]:
+    hit = _inspection_cache.get(key)
+    if hit is not None:
+        _inspection_cache.move_to_end(key)
+    return hit
+
+
+def _inspection_cache_put(key: tuple, value: _RepoInspection) -> None:
+    _inspection_cache[key] = value
+    _inspection_cache.move_to_end(key)
+    while len(_inspection_cache) > _INSPECTION_CACHE_MAX:
+        _inspection_cache.popitem(last=False)
+
+
+async def _remote_head_sha(url: str) -> Optional[str]:
+    """Return the remote HEAD commit sha via git ls-remote, or None if unavailable."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "git", "ls-remote", "--exit-code", url, "HEAD",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=_LS_REMOTE_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    if proc.returncode != 0:
+        return None
+    parts = stdout.decode(errors="replace").split()
+    return parts[0] if parts else None
+
+
+async def _clone_head_sha(repo_root: Path) -> Optional[str]:
+    """Return the HEAD commit sha of a local clone via git rev-parse, or None."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "git", "-C", str(repo_root), "rev-parse", "HEAD",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=_REV_PARSE_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    if proc.returncode != 0:
+        return None
+    return stdout.decode(errors="replace").strip() or None
+
+
+def _inspect_repo(repo_root: Path, graph_id: Optional[str]) -> _RepoInspection:
+    """Parse langgraph.json and AST-inspect the selected graph. Raises HTTPException."""
+    try:
+        lg_config = langgraph_json.parse(repo_root)
+    except LangGraphJsonError as exc:
+        raise HTTPException(422, str(exc))
+
+    graph_entry = langgraph_json.pick_graph(lg_config, graph_id)
+    logger.info("[Import] Selected graph: %s → %s:%s",
+                graph_entry.graph_id, graph_entry.file_path, graph_entry.export_name)
+
+    try:
+        result = inspector.inspect_graph_entry(repo_root, graph_entry.file_path)
+    except InspectionError as exc:
+        raise HTTPException(422, str(exc))
+
+    return _RepoInspection(
+        lg_config=lg_config,
+        graph_entry=graph_entry,
+        result=result,
+        readme_excerpt=_read_readme(repo_root),
+        requirements=_collect_requirements(repo_root),
+    )
+
+
+_CFR_FALLBACK_ERRNOS = frozenset({errno.EXDEV, errno.ENOTSUP, errno.EINVAL, errno.ENOSYS})
+
+
+def _copy_file_range_copy(src: str, dst: str) -> str:
+    """
+    shutil.copytree copy_function using os.copy_file_range.
+
+    On reflink-capable filesystems (btrfs, XFS, ...) the kernel shares extents
+    instead of copying data. Falls back to shutil.copy2 when the kernel or
+    filesystem refuses the call.
+    """
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if n == 0:
+                    break
+                remaining -= n
+    except OSError as exc:
+        if exc.errno not in _CFR_FALLBACK_ERRNOS:
+            raise
+        return shutil.copy2(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
 def _copy_source(repo_root: Path, plugin_dir: Path) -> None:
     """Copy the entire repo into plugin_dir/src/ so the external code is importable."""
     src_dir = plugin_dir / "src"
     if src_dir.exists():
         shutil.rmtree(src_dir)
-    shutil.copytree(repo_root, src_dir, dirs_exist_ok=False)
+    copy_function = shutil.copy2
+    if (
+        sys.platform == "linux"
+        and hasattr(os, "copy_file_range")
+        and os.stat(repo_root).st_dev == os.stat(plugin_dir).st_dev
+    ):
+        copy_function = _copy_file_range_copy
+    shutil.copytree(repo_root, src_dir, dirs_exist_ok=False, copy_function=copy_function)
+
+
+def _write_bytes_atomic(dest: Path, data: bytes) -> None:
+    """Write data to a sibling temp file with raw os.write, then rename over dest."""
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, dest)
 
 
 def _write_files(plugin_dir: Path, files: Dict[str, str]) -> List[str]:
     """Write rendered file contents to plugin_dir. Returns list of written paths."""
     plugin_dir.mkdir(parents=True, exist_ok=True)
+    # Encode everything up front so a bad file fails before anything is replaced.
+    encoded = [(plugin_dir / fn, content.encode("utf-8")) for fn, content in files.items()]
     written = []
-    for filename, content in files.items():
-        dest = plugin_dir / filename
-        dest.write_text(content, encoding="utf-8")
+    for dest, data in encoded:
+        _write_bytes_atomic(dest, data)
         written.append(str(dest))
         logger.info("[Import] Wrote %s", dest)
     return written
@@ -241,18 +526,25 @@ def _collect_requirements(repo_root: Path) -> List[str]:
     Find requirements.txt files in the repo (root + one level deep) and
     return the merged, deduplicated list of non-comment package specifiers.
     """
-    candidates = list(repo_root.glob("requirements.txt"))
-    candidates += [
-        p for p in repo_root.glob("*/requirements.txt")
-        if p.parent != repo_root  # already covered by glob above
-    ]
+    candidates: List[Path] = []
+    root_req = repo_root / "requirements.txt"
+    if root_req.is_file():
+        candidates.append(root_req)
+    # One listing of the repo root instead of a second glob pass.
+    with os.scandir(repo_root) as it:
+        for entry in it:
+            if entry.is_dir():
+                sub_req = Path(entry.path) / "requirements.txt"
+                if sub_req.is_file():
+                    candidates.append(sub_req)
 
     seen: dict[str, None] = {}  # ordered dedup
     for req_file in candidates:
-        for raw in req_file.read_text(encoding="utf-8", errors="replace").splitlines():
-            line = raw.strip()
-            if line and not line.startswith("#"):
-                seen[line] = None
+        with req_file.open("r", encoding="utf-8", errors="replace") as fh:
+            for raw in fh:
+                line = raw.strip()
+                if line and not line.startswith("#"):
+                    seen[line] = None
 
     return list(seen)
 
@@ -265,168 +557,186 @@ def _write_requirements(plugin_dir: Path, requirements: List[str]) -> Optional[s
     if not requirements:
         return None
     dest = plugin_dir / "requirements_import.txt"
-    dest.write_text(
+    _write_bytes_atomic(dest, (
         "# Dependencies required by this imported agent.\n"
         "# Install with: pip install -r requirements_import.txt\n"
-        + "\n".join(requirements) + "\n",
-        encoding="utf-8",
-    )
+        + "\n".join(requirements) + "\n"
+    ).encode("utf-8"))
     logger.info("[Import] Wrote %s", dest)
     return str(dest)
 
 
-_SERVER_DIR = Path(__file__).parent.parent   # server/
 _SMOKE_TEST_TIMEOUT_S = 15
 
 
 async def _install_requirements(requirements: List[str], plugin_dir: Path) -> tuple[bool, str]:
     """
-    Install agent dependencies into the running venv with pip.
+    Install agent dependencies into the running venv with pip (or uv pip).
 
     Uses sys.executable so the same venv that runs the server receives the
     packages — identical to the fix applied to the import check subprocess.
+    When uv is on PATH it is used via `uv pip install --python sys.executable`.
     Returns (ok, error_message).
     """
     if not requirements:
         return True, ""
 
     req_file = plugin_dir / "requirements_import.txt"
-    cmd = (
-        [sys.executable, "-m", "pip", "install", "-r", str(req_file)]
-        if req_file.exists()
-        else [sys.executable, "-m", "pip", "install"] + requirements
+    pip = (
+        [_UV, "pip", "install", "--python", sys.executable]
+        if _UV
+        else [sys.executable, "-m", "pip", "install"]
     )
+    cmd = pip + (["-r", str(req_file)] if req_file.exists() else requirements)
     logger.info("[Import] Installing %d requirement(s): %s", len(requirements), requirements)
+    async with _PIP_SEM:
+        return await _run_pip(cmd)
+
+
+async def _stderr_tail(stream: asyncio.StreamReader, limit: int) -> bytes:
+    """Read stream to EOF in fixed-size chunks, keeping only the last `limit` bytes."""
+    # read(n) rather than line iteration: a single line longer than the
+    # StreamReader limit would otherwise raise ValueError mid-install.
+    tail = bytearray()
+    while chunk := await stream.read(65536):
+        tail += chunk
+        if len(tail) > limit:
+            del tail[:-limit]
+    return bytes(tail)
+
+
+async def _run_pip(cmd: List[str]) -> tuple[bool, str]:
+    """
+    Run a pip command under the install timeout. Returns (ok, error_message).
+
+    stdout is discarded and stderr is streamed through a bounded tail, so a
+    very chatty failing install cannot balloon the server's memory. The error
+    message is the end of stderr, where pip reports what actually failed.
+    On any error, timeout or cancellation pip is killed and reaped before
+    returning, so it never outlives its _PIP_SEM slot.
+    """
     try:
         proc = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
         )
-        stdout, stderr = await asyncio.wait_for(
-            proc.communicate(), timeout=_PIP_INSTALL_TIMEOUT_S
+    except Exception as exc:
+        return False, str(exc)
+    try:
+        stderr, _ = await asyncio.wait_for(
+            asyncio.gather(_stderr_tail(proc.stderr, _PIP_STDERR_TAIL_BYTES), proc.wait()),
+            timeout=_PIP_INSTALL_TIMEOUT_S,
         )
         if proc.returncode != 0:
-            err = (stderr or stdout or b"").decode(errors="replace")[:800]
+            err = stderr.decode(errors="replace")[-800:]
             logger.error("[Import] pip install failed (rc=%d): %s", proc.returncode, err)
             return False, err
         logger.info("[Import] pip install succeeded")
         return True, ""
     except asyncio.TimeoutError:
-        try:
-            proc.kill()
-        except Exception:
-            pass
         return False, f"pip install timed out after {_PIP_INSTALL_TIMEOUT_S} s"
     except Exception as exc:
         return False, str(exc)
+    finally:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
 
 
-def _run_import_check(plugin_id: str, plugin_class_name: str) -> ValidationResult:
+# Validation children fork from a warm forkserver instead of paying a full
+# `python -c` interpreter start per check; spawn is the portable fallback.
+_MP_CTX = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _recv_stage(conn, proc, timeout: float) -> Optional[tuple[str, Any]]:
     """
-    Subprocess import check: verify the generated plugin can be loaded and
-    instantiated without errors.  Returns a ValidationResult (no smoke_test yet).
+    Wait up to timeout for the next stage message from the validation child.
+
+    Returns None on timeout. A child that dies without reporting yields
+    ("died", <exit code description>).
     """
-    check_code = (
-        f"import sys; sys.path.insert(0, '.');"           # server/ is cwd
-        f"from app.agent.plugins.{plugin_id}.plugin import {plugin_class_name}; "
-        f"p = {plugin_class_name}(); "
-        f"assert p.plugin_id == '{plugin_id}'; "
-        f"print('OK')"
-    )
+    if not conn.poll(timeout):
+        return None
     try:
-        proc = subprocess.run(
-            [sys.executable, "-c", check_code],
-            cwd=str(_SERVER_DIR),
-            capture_output=True,
-            text=True,
-            timeout=_IMPORT_CHECK_TIMEOUT_S,
-        )
-        ok = proc.returncode == 0 and "OK" in proc.stdout
-        error = None if ok else (proc.stderr.strip() or proc.stdout.strip())[:1000]
-        return ValidationResult(import_ok=ok, import_error=error)
-    except subprocess.TimeoutExpired:
-        return ValidationResult(import_ok=False, import_error="Import check timed out")
-    except Exception as exc:
-        return ValidationResult(import_ok=False, import_error=str(exc))
+        return conn.recv()
+    except EOFError:
+        proc.join(1)
+        return ("died", f"Validation process exited with code {proc.exitcode}")
 
 
-def _run_smoke_test(plugin_id: str, plugin_class_name: str) -> SmokeTestResult:
-    """
-    Invoke the generated plugin's graph with an empty transcript (welcome screen path).
+def _smoke_result_from_json(output: str) -> SmokeTestResult:
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+        data = orjson.loads(output) if orjson is not None else json.loads(output)
+    except json.JSONDecodeError as exc:
+        return SmokeTestResult(ok=False, error=f"Smoke test output was not valid JSON: {exc}")
+    return SmokeTestResult(
+        ok=data.get("ok", False),
+        outbox_count=data.get("outbox_count", 0),
+        has_a2ui=data.get("has_a2ui", False),
+        has_voice=data.get("has_voice", False),
+        outbox_sample=data.get("outbox_sample", []),
+    )
 
-    Uses an empty transcript deliberately: the thin-wrapper routes this to
-    handle_welcome, which exercises the plugin/graph/A2UI plumbing without
-    calling the external agent (which may have unresolved dependencies).
 
-    Returns a SmokeTestResult describing what the outbox contained.
+def _run_validation(plugin_id: str, plugin_class_name: str) -> ValidationResult:
     """
-    smoke_code = f"""
-import json, sys
-sys.path.insert(0, '.')
-from app.agent.plugins.{plugin_id}.plugin import {plugin_class_name}
-
-plugin = {plugin_class_name}()
-state = plugin.create_initial_state()
-state['transcript'] = ''        # empty → welcome screen, no external graph call
-state['pendingAction'] = None
-
-graph = plugin.build_graph()
-result = graph.invoke(state, {{}})
-outbox = result.get('outbox', [])
-
-# Truncate large component payloads for safe JSON serialisation
-def _safe_event(e):
-    e = dict(e)
-    if 'payload' in e and isinstance(e['payload'], dict):
-        p = dict(e['payload'])
-        if 'updateComponents' in p and isinstance(p.get('updateComponents'), dict):
-            comps = p['updateComponents'].get('components', [])
-            p['updateComponents'] = {{'component_count': len(comps), 'first': comps[:2]}}
-        if 'text' in p:
-            p['text'] = p['text'][:120]
-        e['payload'] = p
-    return e
-
-sample = [_safe_event(e) for e in outbox[:3]]
-
-print(json.dumps({{
-    'ok': True,
-    'outbox_count': len(outbox),
-    'has_a2ui': any(e.get('type') == 'server.a2ui.patch' for e in outbox),
-    'has_voice': any(e.get('type') == 'server.voice.say' for e in outbox),
-    'outbox_sample': sample,
-}}))
-"""
+    Import-check and smoke-test the generated plugin in a single child process.
+
+    The import stage must verify the plugin can be loaded and instantiated
+    within _IMPORT_CHECK_TIMEOUT_S. Only then is the graph invoked with an
+    empty transcript (welcome screen path), within _SMOKE_TEST_TIMEOUT_S; the
+    thin-wrapper routes this to handle_welcome, exercising the plugin/graph/A2UI
+    plumbing without calling the external agent.
+    """
+    skipped = SmokeTestResult(ok=False, skipped=True, error="Skipped: import check failed")
     try:
-        proc = subprocess.run(
-            [sys.executable, "-c", smoke_code],
-            cwd=str(_SERVER_DIR),
-            capture_output=True,
-            text=True,
-            timeout=_SMOKE_TEST_TIMEOUT_S,
+        recv_conn, send_conn = _MP_CTX.Pipe(duplex=False)
+        proc = _MP_CTX.Process(
+            target=plugin_validation.validate,
+            args=(plugin_id, plugin_class_name, send_conn),
         )
-        if proc.returncode != 0:
-            error = (proc.stderr.strip() or proc.stdout.strip())[:1000]
-            logger.warning("[Import] Smoke test failed (rc=%d): %s", proc.returncode, error)
-            return SmokeTestResult(ok=False, error=error)
-
-        # Parse the JSON line emitted by the smoke code
-        output = proc.stdout.strip()
-        data = json.loads(output)
-        return SmokeTestResult(
-            ok=data.get("ok", False),
-            outbox_count=data.get("outbox_count", 0),
-            has_a2ui=data.get("has_a2ui", False),
-            has_voice=data.get("has_voice", False),
-            outbox_sample=data.get("outbox_sample", []),
-        )
-    except subprocess.TimeoutExpired:
-        return SmokeTestResult(ok=False, error=f"Smoke test timed out after {_SMOKE_TEST_TIMEOUT_S}s")
-    except json.JSONDecodeError as exc:
-        return SmokeTestResult(ok=False, error=f"Smoke test output was not valid JSON: {exc}")
+        proc.start()
+        send_conn.close()
     except Exception as exc:
-        return SmokeTestResult(ok=False, error=str(exc))
+        return ValidationResult(import_ok=False, import_error=str(exc), smoke_test=skipped)
+
+    try:
+        msg = _recv_stage(recv_conn, proc, _IMPORT_CHECK_TIMEOUT_S)
+        if msg is None:
+            return ValidationResult(
+                import_ok=False, import_error="Import check timed out", smoke_test=skipped
+            )
+        status, error = msg
+        if status != "import_ok":
+            return ValidationResult(
+                import_ok=False, import_error=error.strip()[:1000], smoke_test=skipped
+            )
+
+        msg = _recv_stage(recv_conn, proc, _SMOKE_TEST_TIMEOUT_S)
+        if msg is None:
+            smoke = SmokeTestResult(
+                ok=False, error=f"Smoke test timed out after {_SMOKE_TEST_TIMEOUT_S}s"
+            )
+        elif msg[0] == "smoke_ok":
+            smoke = _smoke_result_from_json(msg[1])
+        else:
+            error = msg[1].strip()[:1000]
+            logger.warning("[Import] Smoke test failed: %s", error)
+            smoke = SmokeTestResult(ok=False, error=error)
+        return ValidationResult(import_ok=True, smoke_test=smoke)
+    finally:
+        recv_conn.close()
+        proc.join(1)
+        if proc.is_alive():
+            proc.kill()
+            proc.join()
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────────────
@@ -437,9 +747,15 @@ async def import_agent(req: ImportRequest) -> ImportResponse:
     Clone a LangGraph agent repo and generate a plugin scaffold.
 
     Set dry_run=true to preview generated files without writing to disk.
+    At most _MAX_CONCURRENT_IMPORTS requests run at once; the rest queue.
     """
     logger.info("[Import] Request: plugin_id=%s url=%s dry_run=%s",
                 req.plugin_id, req.url, req.dry_run)
+    async with _IMPORT_SEM:
+        return await _import_agent(req)
+
+
+async def _import_agent(req: ImportRequest) -> ImportResponse:
 
     plugin_dir = _PLUGINS_ROOT / req.plugin_id
 
@@ -452,33 +768,49 @@ async def import_agent(req: ImportRequest) -> ImportResponse:
         )
 
     warnings: List[str] = []
-    tmpdir = tempfile.mkdtemp(prefix="ais_clone_")
+    tmpdir = tempfile.mkdtemp(prefix="ais_clone_", dir=_TMP_ROOT)
     repo_root = Path(tmpdir) / "repo"
 
     try:
-        # ── Step 1: Fetch (clone or copy) ─────────────────────────────────────
-        logger.info("[Import] Acquiring %s", req.url)
-        await _acquire_repo(req.url, repo_root)
-
-        # ── Step 2: Parse langgraph.json ──────────────────────────────────────
-        try:
-            lg_config = langgraph_json.parse(repo_root)
-        except LangGraphJsonError as exc:
-            raise HTTPException(422, str(exc))
-
-        graph_entry = langgraph_json.pick_graph(lg_config, req.graph_id)
-        logger.info("[Import] Selected graph: %s → %s:%s",
-                    graph_entry.graph_id, graph_entry.file_path, graph_entry.export_name)
-
-        # ── Step 3: AST inspection ────────────────────────────────────────────
-        try:
-            result = inspector.inspect_graph_entry(repo_root, graph_entry.file_path)
-        except InspectionError as exc:
-            raise HTTPException(422, str(exc))
+        # ── Step 0: Inspection cache lookup (remote dry runs only) ────────────
+        # Only a dry run can skip the clone on a hit, so only a dry run pays
+        # for the ls-remote round trip.
+        is_remote = not _is_local_path(req.url)
+        cache_key: Optional[tuple] = None
+        inspection: Optional[_RepoInspection] = None
+        if is_remote and req.dry_run and not req.force:
+            sha = await _remote_head_sha(req.url)
+            if sha:
+                inspection = _inspection_cache_get((req.url, sha, req.graph_id))
+                if inspection is not None:
+                    logger.info("[Import] Inspection cache hit for %s@%s", req.url, sha[:12])
 
+        # ── Step 1: Fetch (clone or copy) ─────────────────────────────────────
+        # A dry run with a cached inspection never touches the repo files.
+        if inspection is None:
+            logger.info("[Import] Acquiring %s", req.url)
+            await _acquire_repo(req.url, repo_root)
+            # Key by the commit actually cloned, so a cached inspection always
+            # describes the same tree that is copied into src/.
+            if is_remote:
+                sha = await _clone_head_sha(repo_root)
+                if sha:
+                    cache_key = (req.url, sha, req.graph_id)
+                    if not req.force:
+                        inspection = _inspection_cache_get(cache_key)
+
+        # ── Steps 2–3: Parse langgraph.json + AST inspection ──────────────────
+        if inspection is None:
+            inspection = _inspect_repo(repo_root, req.graph_id)
+            if cache_key is not None:
+                _inspection_cache_put(cache_key, inspection)
+
+        lg_config = inspection.lg_config
+        graph_entry = inspection.graph_entry
+        result = inspection.result
+        readme_excerpt = inspection.readme_excerpt
+        requirements = inspection.requirements
         warnings.extend(result.warnings)
-        readme_excerpt = _read_readme(repo_root)
-        requirements = _collect_requirements(repo_root)
 
         # ── Step 4a: A2UI design ──────────────────────────────────────────────
         external_module = _derive_module_path(graph_entry.file_path)
@@ -543,12 +875,13 @@ async def import_agent(req: ImportRequest) -> ImportResponse:
         validation: Optional[ValidationResult] = None
 
         if not req.dry_run:
-            _write_files(plugin_dir, rendered)
+            # Filesystem writes run in a worker thread to keep the event loop free.
+            await asyncio.to_thread(_write_files, plugin_dir, rendered)
             files_written = [str(plugin_dir / fn) for fn in rendered]
-            _copy_source(repo_root, plugin_dir)
+            await asyncio.to_thread(_copy_source, repo_root, plugin_dir)
 
             # Write requirements_import.txt alongside the plugin files
-            req_path = _write_requirements(plugin_dir, requirements)
+            req_path = await asyncio.to_thread(_write_requirements, plugin_dir, requirements)
             if req_path:
                 files_written.append(req_path)
 
@@ -562,21 +895,18 @@ async def import_agent(req: ImportRequest) -> ImportResponse:
                         f"pip install -r {plugin_dir}/requirements_import.txt"
                     )
 
-            # ── Step 7: Import check ──────────────────────────────────────────
-            validation = _run_import_check(req.plugin_id, gen_config.plugin_class_name)
+            # ── Steps 7–8: Import check + smoke test (one child process) ──────
+            logger.info("[Import] Validating %s", req.plugin_id)
+            validation = await asyncio.to_thread(
+                _run_validation, req.plugin_id, gen_config.plugin_class_name
+            )
+            smoke = validation.smoke_test
             if not validation.import_ok:
                 warnings.append(
                     f"Import check failed: {validation.import_error}. "
                     "The plugin was written to disk but may need manual fixes."
                 )
-                # Skip smoke test — graph won't be invokable
-                validation.smoke_test = SmokeTestResult(ok=False, skipped=True,
-                    error="Skipped: import check failed")
             else:
-                # ── Step 8: Smoke test ────────────────────────────────────────
-                logger.info("[Import] Running smoke test for %s", req.plugin_id)
-                smoke = _run_smoke_test(req.plugin_id, gen_config.plugin_class_name)
-                validation.smoke_test = smoke
                 if not smoke.ok:
                     warnings.append(
                         f"Smoke test failed: {smoke.error}. "
@@ -620,13 +950,18 @@ async def import_agent(req: ImportRequest) -> ImportResponse:
         )
 
     finally:
-        shutil.rmtree(tmpdir, ignore_errors=True)
+        await asyncio.to_thread(shutil.rmtree, tmpdir, ignore_errors=True)
         logger.debug("[Import] Cleaned up temp dir %s", tmpdir)
 
 
 @router.get("/import-agent/plugins")
 async def list_registered_plugins() -> Dict[str, Any]:
-    """Return all currently registered plugin IDs."""
+    """
+    Return all currently registered plugin IDs.
+
+    Served from the in-memory registry, not a scan of _PLUGINS_ROOT: plugins
+    written to disk by an import only appear here once main.py registers them.
+    """
     return {"plugins": list_plugins()}
 
 
@@ -8,8 +8,9 @@ Domain-specific data lives under state["domain"][plugin_id].
 
 from __future__ import annotations
 
+import copy
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Any, ClassVar, Dict, List, Optional, TypedDict
 
 
 # ── Common State ────────────────────────────────────────────────────────────────
@@ -17,6 +18,9 @@ from typing import Any, Dict, List, Optional, TypedDict
 # Phase 1–2: plugins keep mortgage-specific top-level keys for backward compat.
 # Phase 3: those keys migrate under state["domain"]["mortgage"].
 # Only the keys below are read by runtime code (main.py / process_outbox).
+# Kept as a TypedDict (a plain dict at runtime): LangGraph, main.py and every
+# plugin exchange state dicts, so an attribute-access wrapper would only add
+# a conversion at each boundary.
 
 class CommonState(TypedDict, total=False):
     mode: str                           # "voice" | "text"
@@ -47,10 +51,27 @@ class PluginBase(ABC):
     """
     Abstract base for all domain plugins.
 
-    Implement plugin_id, create_initial_state, and build_graph.
-    validate_action and capabilities have sensible defaults.
+    Implement plugin_id and build_graph, and override _INITIAL_TEMPLATE with
+    the plugin's domain data. create_initial_state, validate_action and
+    capabilities have sensible defaults.
     """
 
+    # Static CommonState envelope copied for every new session. Subclasses
+    # override this (usually just "domain") rather than create_initial_state;
+    # state_version is filled in from the property at copy time.
+    _INITIAL_TEMPLATE: ClassVar[Dict[str, Any]] = {
+        "mode": "text",
+        "device": "desktop",
+        "transcript": "",
+        "messages": [],
+        "ui": {"surfaceId": "main", "state": "LOADING"},
+        "errors": None,
+        "pendingAction": None,
+        "outbox": [],
+        "meta": {},
+        "domain": {},
+    }
+
     @property
     @abstractmethod
     def plugin_id(self) -> str:
@@ -62,15 +83,17 @@ class PluginBase(ABC):
         """Increment when the plugin's domain state shape changes."""
         return 1
 
-    @abstractmethod
     def create_initial_state(self) -> Dict[str, Any]:
         """
         Return a fully-initialised state dict for a new session.
 
-        Must include every key in CommonState plus any plugin-specific
-        top-level keys needed during the Phase 1–2 compatibility window.
+        Deep-copies _INITIAL_TEMPLATE so sessions never share mutable
+        members. Override only when the initial state depends on runtime
+        data (e.g. persisted domain state), building on super().
         """
-        ...
+        state = copy.deepcopy(self._INITIAL_TEMPLATE)
+        state["state_version"] = self.state_version
+        return state
 
     @abstractmethod
     def build_graph(self):
@@ -8,18 +8,31 @@ either write to disk or return as a dry-run preview.
 
 from __future__ import annotations
 
+import json
+import os
 import pprint
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+)
 
-from app.agent.core.importer.inspector import InspectionResult
+from app.agent.core.importer.inspector import InspectionResult, StateField
 
 _TEMPLATES_DIR = Path(__file__).parent / "templates"
-_VALID_PLUGIN_ID = re.compile(r"^[a-z][a-z0-9_]{1,31}$")
+# \Z (not $) so even a plain .match() rejects a trailing newline.
+_VALID_PLUGIN_ID = re.compile(r"^[a-z][a-z0-9_]{1,31}\Z", re.ASCII)
+
+# LangGraph envelope fields left out of the generated default domain state.
+_SKIP_FIELDS: frozenset[str] = frozenset({"messages", "config", "configurable"})
 
 
 # ---------------------------------------------------------------------------
@@ -34,7 +47,7 @@ class GeneratorConfig:
     graph_export: str             # variable name in that module, e.g. "graph"
     input_field: str              # state key that holds user input, e.g. "messages"
     output_accessor: str          # Python expression to get response, e.g. "messages[-1].content"
-    state_fields: List[dict]      # [{"name": ..., "annotation": ...}, ...]
+    state_fields: List[StateField]  # .name / .annotation, as found by the inspector
     initial_domain_state: dict    # default values for domain[plugin_id]
     # Fallback A2UI screens (replaced by LLM output in Phase 2)
     screens: dict                 # {"welcome": {...}, "result": {...}}
@@ -45,66 +58,88 @@ class GeneratorConfig:
 # Validation
 # ---------------------------------------------------------------------------
 
+# Cached: config_from_inspection() and render() both validate the same id.
+# Only successes are cached; invalid ids raise (and re-check) every time.
+@lru_cache(maxsize=256)
 def validate_plugin_id(plugin_id: str) -> None:
-    if not _VALID_PLUGIN_ID.match(plugin_id):
+    if not _VALID_PLUGIN_ID.fullmatch(plugin_id):
         raise ValueError(
             f"Invalid plugin_id '{plugin_id}'. "
             "Must match ^[a-z][a-z0-9_]{{1,31}}$"
         )
 
 
+@lru_cache(maxsize=512)
+def agent_display_name(plugin_id: str) -> str:
+    """Display name for a plugin id: "simple_qa" → "Simple Qa"."""
+    # Per-word capitalize(), not str.title(): title() would also upper-case
+    # letters after digits and change generated class names ("v2x" → "V2X").
+    return " ".join(w.capitalize() for w in plugin_id.split("_"))
+
+
 # ---------------------------------------------------------------------------
 # Default (Phase 1) A2UI screens
 # These are minimal DataCard scaffolds.  Phase 2 replaces them with
 # LLM-designed component trees.
 # ---------------------------------------------------------------------------
 
-def _default_screens(plugin_id: str, agent_name: str) -> dict:
-    return {
-        "welcome": {
-            "title": agent_name,
-            "voice_text": f"Hello! I'm your {agent_name} assistant. How can I help you today?",
-            "components": [
-                {"id": "root", "component": "Column", "children": ["welcome_card"]},
-                {
-                    "id": "welcome_card",
-                    "component": "DataCard",
-                    "text": agent_name,
-                    "data": {
-                        "detail": "How can I help you today? Type or speak your question.",
-                    },
-                },
-            ],
-        },
-        "result": {
-            "title": "Response",
-            "voice_text": "{response}",   # placeholder — substituted at runtime
-            "components": [
-                {"id": "root", "component": "Column", "children": ["result_card"]},
-                {
-                    "id": "result_card",
-                    "component": "DataCard",
-                    "text": "Response",
-                    "data": {"detail": "{response}"},  # substituted at runtime
+# Serialised once with a placeholder for the agent name; each call is then a
+# string replace plus one C-level json.loads instead of rebuilding the tree.
+_AGENT_NAME = "__AGENT_NAME__"
+
+_DEFAULT_SCREENS = {
+    "welcome": {
+        "title": _AGENT_NAME,
+        "voice_text": f"Hello! I'm your {_AGENT_NAME} assistant. How can I help you today?",
+        "components": [
+            {"id": "root", "component": "Column", "children": ["welcome_card"]},
+            {
+                "id": "welcome_card",
+                "component": "DataCard",
+                "text": _AGENT_NAME,
+                "data": {
+                    "detail": "How can I help you today? Type or speak your question.",
                 },
-            ],
-        },
-        "error": {
-            "title": "Something went wrong",
-            "voice_text": "Sorry, something went wrong. Please try again.",
-            "components": [
-                {"id": "root", "component": "Column", "children": ["error_card"]},
-                {
-                    "id": "error_card",
-                    "component": "DataCard",
-                    "text": "Error",
-                    "data": {
-                        "detail": "Something went wrong. Please try again.",
-                    },
+            },
+        ],
+    },
+    "result": {
+        "title": "Response",
+        "voice_text": "{response}",   # placeholder — substituted at runtime
+        "components": [
+            {"id": "root", "component": "Column", "children": ["result_card"]},
+            {
+                "id": "result_card",
+                "component": "DataCard",
+                "text": "Response",
+                "data": {"detail": "{response}"},  # substituted at runtime
+            },
+        ],
+    },
+    "error": {
+        "title": "Something went wrong",
+        "voice_text": "Sorry, something went wrong. Please try again.",
+        "components": [
+            {"id": "root", "component": "Column", "children": ["error_card"]},
+            {
+                "id": "error_card",
+                "component": "DataCard",
+                "text": "Error",
+                "data": {
+                    "detail": "Something went wrong. Please try again.",
                 },
-            ],
-        },
-    }
+            },
+        ],
+    },
+}
+_DEFAULT_SCREENS_JSON = json.dumps(_DEFAULT_SCREENS)
+
+
+def _default_screens(plugin_id: str, agent_name: str) -> dict:
+    # json.dumps escapes the name; [1:-1] drops the surrounding quotes.
+    return json.loads(
+        _DEFAULT_SCREENS_JSON.replace(_AGENT_NAME, json.dumps(agent_name)[1:-1])
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -131,17 +166,11 @@ def config_from_inspection(
     """
     validate_plugin_id(plugin_id)
 
-    agent_name = " ".join(w.capitalize() for w in plugin_id.split("_"))
+    agent_name = agent_display_name(plugin_id)
     plugin_class_name = agent_name.replace(" ", "") + "Plugin"
 
-    state_fields = [
-        {"name": f.name, "annotation": f.annotation}
-        for f in inspection.state_fields
-    ]
-
     # Default domain state: one null entry per detected state field
     # (minus common LangGraph envelope fields we don't want to duplicate).
-    _SKIP_FIELDS = {"messages", "config", "configurable"}
     default_domain_state = {
         f.name: None
         for f in inspection.state_fields
@@ -155,7 +184,7 @@ def config_from_inspection(
         graph_export=graph_export,
         input_field=input_field_override or inspection.detected_input_field,
         output_accessor=output_accessor_override or inspection.detected_output_field,
-        state_fields=state_fields,
+        state_fields=list(inspection.state_fields),
         initial_domain_state=(
             initial_domain_state_override
             if initial_domain_state_override is not None
@@ -170,6 +199,66 @@ def config_from_inspection(
 # Renderer
 # ---------------------------------------------------------------------------
 
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """
+    Persist compiled template code across process starts.
+
+    Defaults to Jinja's per-user temp directory so nothing is written into the
+    source tree; NOVA_JINJA_CACHE_DIR overrides it. Returns None (no cache)
+    when the directory cannot be created.
+    """
+    directory = os.environ.get("NOVA_JINJA_CACHE_DIR")
+    try:
+        if directory:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(directory)
+    except (OSError, RuntimeError):
+        return None
+
+
+def _to_python(value) -> str:
+    """
+    Jinja filter: write a JSON-like value as a Python literal.
+
+    repr() already emits None/True/False rather than null/true/false, so
+    anything that fits on one line goes straight through it; only longer
+    values pay for pprint's line wrapping. Key order is preserved either way.
+    """
+    text = repr(value)
+    if len(text) <= 100:
+        return text
+    return pprint.pformat(value, width=100, sort_dicts=False)
+
+
+# One Environment for the process: templates are read, lexed and compiled
+# once here rather than on every render(). auto_reload is off because the
+# templates ship with the package; restart the server after editing them.
+# Between _TEMPLATES (steady state) and the bytecode cache (cold start) no
+# lex/parse/codegen happens at render time, so an ahead-of-time
+# compile_templates() archive plus ModuleLoader would only add a build
+# artefact that can go stale.
+_ENV = Environment(
+    loader=FileSystemLoader(str(_TEMPLATES_DIR)),
+    undefined=StrictUndefined,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+    auto_reload=False,
+    bytecode_cache=_bytecode_cache(),
+)
+_ENV.filters["to_python"] = _to_python
+
+_TEMPLATE_MAP = (
+    ("plugin.py.j2",        "plugin.py"),
+    ("graph_wrapper.py.j2", "graph.py"),
+    ("init.py.j2",          "__init__.py"),
+)
+_TEMPLATES: Dict[str, Template] = {
+    output_name: _ENV.get_template(template_name)
+    for template_name, output_name in _TEMPLATE_MAP
+}
+
+
 def render(config: GeneratorConfig) -> Dict[str, str]:
     """
     Render all plugin scaffold files.
@@ -179,17 +268,6 @@ def render(config: GeneratorConfig) -> Dict[str, str]:
     """
     validate_plugin_id(config.plugin_id)
 
-    env = Environment(
-        loader=FileSystemLoader(str(_TEMPLATES_DIR)),
-        undefined=StrictUndefined,
-        trim_blocks=True,
-        lstrip_blocks=True,
-        keep_trailing_newline=True,
-    )
-    # Use pprint.pformat so Python literals (None, True, False) are written
-    # instead of JSON literals (null, true, false).
-    env.filters["to_python"] = lambda v: pprint.pformat(v, width=100)
-
     context = {
         "plugin_id": config.plugin_id,
         "plugin_class_name": config.plugin_class_name,
@@ -203,14 +281,9 @@ def render(config: GeneratorConfig) -> Dict[str, str]:
         "readme_excerpt": config.readme_excerpt,
     }
 
-    files: Dict[str, str] = {}
-
-    for template_name, output_name in [
-        ("plugin.py.j2",        "plugin.py"),
-        ("graph_wrapper.py.j2", "graph.py"),
-        ("init.py.j2",          "__init__.py"),
-    ]:
-        tmpl = env.get_template(template_name)
-        files[output_name] = tmpl.render(**context)
-
-    return files
+    # One context dict shared by all templates, passed as-is rather than
+    # re-packed from **kwargs for each render.
+    return {
+        output_name: tmpl.render(context)
+        for output_name, tmpl in _TEMPLATES.items()
+    }
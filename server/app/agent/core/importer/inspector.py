@@ -14,30 +14,36 @@ Extracts:
 from __future__ import annotations
 
 import ast
+import multiprocessing
+import os
 import re
+import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StateField:
     name: str
     annotation: str          # stringified type annotation
     has_reducer: bool = False  # True when Annotated[..., reducer_fn] is used
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NodeInfo:
     name: str                # string label used in add_node("name", ...)
     function: str            # the function/callable passed to add_node
 
 
-@dataclass
+@dataclass(slots=True)
 class InspectionResult:
     # State
     state_class: Optional[str]
@@ -53,8 +59,14 @@ class InspectionResult:
 
     # Extras
     pydantic_models: List[str]       # class names that inherit from BaseModel
-    source_snippet: str              # first 3000 chars for LLM prompts
     warnings: List[str] = field(default_factory=list)
+    # Full source, shared with the parse cache; see source_snippet.
+    _source: str = field(default="", repr=False)
+
+    @property
+    def source_snippet(self) -> str:
+        """First 3000 chars of the source for LLM prompts, sliced on access."""
+        return self._source[:3000]
 
 
 class InspectionError(ValueError):
@@ -65,27 +77,68 @@ class InspectionError(ValueError):
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _annotation_to_str(node: ast.expr) -> str:
-    """Render an AST annotation node back to a readable string."""
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")   # the line endings ast counts
+
+
+def _annotation_to_str(node: ast.expr, lines: List[str]) -> str:
+    """
+    Return an annotation's source text.
+
+    Single-line annotations are sliced straight out of the source lines
+    (col offsets are UTF-8 byte offsets, so non-ASCII lines are encoded
+    first); multi-line ones fall back to ast.unparse.
+    """
+    if node.lineno == node.end_lineno and node.lineno <= len(lines):
+        line = lines[node.lineno - 1]
+        if line.isascii():
+            return line[node.col_offset:node.end_col_offset]
+        return line.encode()[node.col_offset:node.end_col_offset].decode()
     return ast.unparse(node)
 
 
-def _is_typeddict(bases: list[ast.expr]) -> bool:
+def _base_kind(bases: list[ast.expr]) -> Optional[str]:
+    """
+    Classify a class by its bases in one pass over them.
+
+    Returns "TypedDict" or "BaseModel" when a base has that name, bare or
+    dotted (typing.TypedDict, pydantic.BaseModel); TypedDict wins if both
+    appear. Returns None otherwise.
+    """
+    names = set()
     for base in bases:
-        if isinstance(base, ast.Name) and base.id == "TypedDict":
-            return True
-        if isinstance(base, ast.Attribute) and base.attr == "TypedDict":
-            return True
-    return False
+        if isinstance(base, ast.Name):
+            names.add(base.id)
+        elif isinstance(base, ast.Attribute):
+            names.add(base.attr)
+    if "TypedDict" in names:
+        return "TypedDict"
+    if "BaseModel" in names:
+        return "BaseModel"
+    return None
 
 
-def _is_basemodel(bases: list[ast.expr]) -> bool:
-    for base in bases:
-        if isinstance(base, ast.Name) and base.id == "BaseModel":
-            return True
-        if isinstance(base, ast.Attribute) and base.attr == "BaseModel":
-            return True
-    return False
+# Node types that can hold statements in their list fields.
+_BLOCK_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _iter_statements(tree: ast.Module):
+    """
+    Yield tree and every statement under it, breadth-first like ast.walk().
+
+    Only statement lists (body, handlers, orelse, finalbody, cases) are
+    followed — ClassDef, Expr and Assign, the only nodes inspect_file()
+    looks at, are statements, so expression subtrees are never visited.
+    The visiting order matches ast.walk(), which decides which TypedDict
+    counts as "first" and the order of detected nodes.
+    """
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        yield node
+        for name in node._fields:
+            value = getattr(node, name, None)
+            if isinstance(value, list):
+                queue.extend(v for v in value if isinstance(v, _BLOCK_NODES))
 
 
 def _extract_string_arg(node: ast.expr) -> Optional[str]:
@@ -118,46 +171,108 @@ _KNOWN_OUTPUT_FIELDS = {
 }
 
 
+# Lower index = preferred when a state defines several known fields.
+_INPUT_PRIORITY = {name: i for i, name in enumerate(_KNOWN_INPUT_FIELDS)}
+_OUTPUT_PRIORITY = {name: i for i, name in enumerate(_KNOWN_OUTPUT_FIELDS)}
+
+
 def _guess_io_fields(
     state_fields: List[StateField],
 ) -> tuple[str, str]:
     field_names = {f.name for f in state_fields}
 
-    input_field = "messages"  # safe default
-    for candidate in _KNOWN_INPUT_FIELDS:
-        if candidate in field_names:
-            input_field = candidate
-            break
+    inputs = field_names & _INPUT_PRIORITY.keys()
+    input_field = (
+        min(inputs, key=_INPUT_PRIORITY.__getitem__) if inputs
+        else "messages"  # safe default
+    )
 
-    output_field = _KNOWN_OUTPUT_FIELDS.get(input_field, f"{input_field}[-1]")
-    for f_name, accessor in _KNOWN_OUTPUT_FIELDS.items():
-        if f_name in field_names:
-            output_field = accessor
-            break
+    outputs = field_names & _OUTPUT_PRIORITY.keys()
+    if outputs:
+        output_field = _KNOWN_OUTPUT_FIELDS[min(outputs, key=_OUTPUT_PRIORITY.__getitem__)]
+    else:
+        output_field = _KNOWN_OUTPUT_FIELDS.get(input_field, f"{input_field}[-1]")
 
     return input_field, output_field
 
 
 # ---------------------------------------------------------------------------
-# Main inspection function
+# Parsed-source cache
 # ---------------------------------------------------------------------------
+#
+# Keyed by (path, st_mtime_ns, st_size) so an edited file is re-parsed. The
+# trees are only ever read, never mutated, so sharing them is safe.
 
-def inspect_file(source_path: Path) -> InspectionResult:
-    """
-    Parse source_path with ast and return an InspectionResult.
+_AST_CACHE_MAX = 128
+_ast_cache: "OrderedDict[tuple, tuple[str, ast.Module]]" = OrderedDict()
+_ast_cache_lock = threading.Lock()
 
-    Raises InspectionError if the file cannot be read or parsed.
-    """
+
+def _read_fd(fd: int, size: int) -> bytes:
+    """Read fd to EOF; normally a single os.read() of the stat'ed size."""
+    data = os.read(fd, size + 1)   # +1 so a file still at `size` hits EOF here
+    if len(data) <= size:
+        return data
+    chunks = [data]
+    while chunk := os.read(fd, 1 << 16):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _parse_source(source_path: Path) -> tuple[str, ast.Module]:
+    """Return (source, tree) for source_path, reusing a cached parse when unchanged."""
     try:
-        source = source_path.read_text(encoding="utf-8")
-    except OSError as exc:
+        fd = os.open(source_path, os.O_RDONLY)
+        try:
+            # One fstat serves both the cache key and the read size.
+            st = os.fstat(fd)
+            key = (str(source_path), st.st_mtime_ns, st.st_size)
+            with _ast_cache_lock:
+                hit = _ast_cache.get(key)
+                if hit is not None:
+                    _ast_cache.move_to_end(key)
+                    return hit
+            data = _read_fd(fd, st.st_size)
+        finally:
+            os.close(fd)
+        source = data.decode("utf-8")
+    except (OSError, UnicodeDecodeError) as exc:
         raise InspectionError(f"Cannot read {source_path}: {exc}") from exc
 
+    # read_text() used universal newlines; keep snippets and offsets identical.
+    if "\r" in source:
+        source = source.replace("\r\n", "\n").replace("\r", "\n")
+
     try:
         tree = ast.parse(source, filename=str(source_path))
     except SyntaxError as exc:
         raise InspectionError(f"Syntax error in {source_path}: {exc}") from exc
 
+    with _ast_cache_lock:
+        _ast_cache[key] = (source, tree)
+        if len(_ast_cache) > _AST_CACHE_MAX:
+            _ast_cache.popitem(last=False)
+    return source, tree
+
+
+# ---------------------------------------------------------------------------
+# Main inspection function
+# ---------------------------------------------------------------------------
+
+# Top-level statements whose bodies are module-level code, not definitions.
+_BLOCK_STMTS = (
+    ast.If, ast.With, ast.AsyncWith, ast.Try, ast.For, ast.AsyncFor,
+    ast.While, ast.Match,
+) + ((ast.TryStar,) if hasattr(ast, "TryStar") else ())
+
+def inspect_file(source_path: Path) -> InspectionResult:
+    """
+    Parse source_path with ast and return an InspectionResult.
+
+    Raises InspectionError if the file cannot be read or parsed.
+    """
+    source, tree = _parse_source(source_path)
+
     state_class: Optional[str] = None
     state_fields: List[StateField] = []
     pydantic_models: List[str] = []
@@ -166,21 +281,36 @@ def inspect_file(source_path: Path) -> InspectionResult:
     warnings: List[str] = []
 
     # ── Walk the AST ─────────────────────────────────────────────────────────
-
-    for node in ast.walk(tree):
+    #
+    # _iter_statements yields the module, then tree.body, then nested blocks.
+    # A typical LangGraph file defines its state, nodes and compile() at top
+    # level; once those are all found, nested blocks are not visited at all.
+    # Otherwise (e.g. a build_graph() function) the walk carries on into them.
+    # A top-level if/with/try/loop/match can hide more add_node() calls
+    # (e.g. feature-flagged nodes), so its presence disables the early exit.
+
+    top_level_end = (
+        -1 if any(isinstance(stmt, _BLOCK_STMTS) for stmt in tree.body)
+        else 1 + len(tree.body)
+    )
+    for i, node in enumerate(_iter_statements(tree)):
+        if i == top_level_end and state_class and compiled_export and nodes:
+            break
 
         # 1. Class definitions — find TypedDicts and Pydantic models
         if isinstance(node, ast.ClassDef):
-            if _is_typeddict(node.bases):
+            kind = _base_kind(node.bases)
+            if kind == "TypedDict":
                 if state_class is None:
                     # Take the first TypedDict found as the state class
                     state_class = node.name
+                    lines = _LINE_BREAK.split(source)
                     for item in node.body:
                         if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                            ann_str = _annotation_to_str(item.annotation)
+                            ann_str = _annotation_to_str(item.annotation, lines)
                             has_reducer = "Annotated" in ann_str
                             state_fields.append(StateField(
-                                name=item.target.id,
+                                name=sys.intern(item.target.id),
                                 annotation=ann_str,
                                 has_reducer=has_reducer,
                             ))
@@ -190,7 +320,7 @@ def inspect_file(source_path: Path) -> InspectionResult:
                         f"Ignoring '{node.name}'."
                     )
 
-            elif _is_basemodel(node.bases):
+            elif kind == "BaseModel":
                 pydantic_models.append(node.name)
 
         # 2. Calls — find add_node and compile()
@@ -198,23 +328,16 @@ def inspect_file(source_path: Path) -> InspectionResult:
             call = node.value
             _check_add_node(call, nodes)
 
-        elif isinstance(node, ast.Assign):
+        elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Call):
+            call = node.value
+            attr = call.func.attr if isinstance(call.func, ast.Attribute) else None
             # Look for: varname = builder.compile() or varname = workflow.compile()
-            if (
-                len(node.targets) == 1
-                and isinstance(node.targets[0], ast.Name)
-                and isinstance(node.value, ast.Call)
-            ):
-                call = node.value
-                if (
-                    isinstance(call.func, ast.Attribute)
-                    and call.func.attr == "compile"
-                ):
+            if attr == "compile":
+                if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
                     compiled_export = node.targets[0].id
-
-            # Also scan for add_node in chained assignments
-            if isinstance(node.value, ast.Call):
-                _check_add_node(node.value, nodes)
+            # Also catch add_node in chained assignments
+            elif attr == "add_node":
+                _check_add_node(call, nodes)
 
     # ── Heuristics ───────────────────────────────────────────────────────────
 
@@ -237,8 +360,8 @@ def inspect_file(source_path: Path) -> InspectionResult:
         detected_input_field=input_field,
         detected_output_field=output_field,
         pydantic_models=pydantic_models,
-        source_snippet=source[:3000],
         warnings=warnings,
+        _source=source,
     )
 
 
@@ -267,7 +390,9 @@ def _check_add_node(call: ast.Call, nodes: List[NodeInfo]) -> None:
     else:
         fn = name  # LangGraph allows add_node(fn) where fn.__name__ is the node
 
-    nodes.append(NodeInfo(name=name, function=fn))
+    # Node names ("agent", "tools", ...) repeat across inspections; intern
+    # them so cached results share one string object per name.
+    nodes.append(NodeInfo(name=sys.intern(name), function=sys.intern(fn)))
 
 
 # ---------------------------------------------------------------------------
@@ -287,3 +412,25 @@ def inspect_graph_entry(
             f"Graph source file not found: {full_path}"
         )
     return inspect_file(full_path)
+
+
+def inspect_many(
+    entries: List[Tuple[Path, str]],
+    workers: Optional[int] = None,
+) -> List[InspectionResult]:
+    """
+    Batch form of inspect_graph_entry() over (repo_root, file_path) pairs.
+
+    Parsing is CPU-bound, so entries are spread over a process pool; results
+    come back in input order. A single entry is inspected in-process. The
+    first InspectionError raised by any entry propagates.
+    """
+    if len(entries) <= 1:
+        return [inspect_graph_entry(root, fp) for root, fp in entries]
+
+    ctx = multiprocessing.get_context(
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    roots, file_paths = zip(*entries)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        return list(pool.map(inspect_graph_entry, roots, file_paths))
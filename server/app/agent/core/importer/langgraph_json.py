@@ -18,8 +18,13 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads   # accepts bytes too
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class GraphEntry:
     graph_id: str
     file_path: str       # e.g. "my_agent/agent.py"  (relative to repo root)
@@ -45,16 +50,17 @@ def parse(repo_root: Path) -> LangGraphConfig:
     Raises LangGraphJsonError if the file is absent or malformed.
     """
     config_path = repo_root / "langgraph.json"
-    if not config_path.exists():
+    try:
+        raw_bytes = config_path.read_bytes()
+    except FileNotFoundError:
         raise LangGraphJsonError(
             f"langgraph.json not found in {repo_root}. "
             "Is this a LangGraph project?"
-        )
+        ) from None
 
     try:
-        with config_path.open() as fh:
-            data = json.load(fh)
-    except json.JSONDecodeError as exc:
+        data = _loads(raw_bytes)
+    except json.JSONDecodeError as exc:   # orjson.JSONDecodeError subclasses this
         raise LangGraphJsonError(f"langgraph.json is not valid JSON: {exc}") from exc
 
     graphs_raw = data.get("graphs")
@@ -4,8 +4,9 @@ llm_designer.py — LLM-assisted A2UI component tree design for imported agents.
 Two-pass pipeline
 ─────────────────
 Pass 1  (Haiku)   Fast field-mapping: confirm which state key is the user input
-                  and how to access the agent's response.  Only runs when the
-                  inspector's heuristics are uncertain (i.e. no recognised field).
+                  and how to access the agent's response.  Only runs when both
+                  design attempts fail and the inspector's heuristics are
+                  uncertain (i.e. no recognised field).
 
 Pass 2  (Sonnet)  Full A2UI design: generates welcome / result / error screens,
                   voice text, initial domain state, and reasoning notes.
@@ -16,21 +17,41 @@ Fallback chain
   Haiku LLM call fails  → use Phase-1 minimal DataCard defaults (no exception raised)
   Bedrock not configured → same minimal defaults
 
-All LLM calls are wrapped in asyncio.to_thread so they don't block the event loop.
+All LLM calls run on a dedicated Bedrock thread pool (_to_bedrock_thread) so
+they don't block the event loop or compete with the loop's default executor.
+Both Pass-2 attempts start from the inspector's field hints and return the
+final mapping themselves; Pass 1 only fills in the mapping for the Phase-1
+fallback.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import copy
+import functools
+import hashlib
 import json
 import logging
 import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from pydantic import BaseModel, Field, ValidationError
 
-from app.agent.core.importer.inspector import InspectionResult
+from app.agent.core.importer.generator import agent_display_name
+from app.agent.core.importer.inspector import InspectionResult, NodeInfo, StateField
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +68,23 @@ _DEFAULT_HAIKU = os.getenv(
 
 _AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 
+# Upper bound on concurrent design() calls in design_batch(), to stay inside
+# the account's Bedrock request-rate limits.
+_MAX_CONCURRENCY = int(os.getenv("DESIGNER_MAX_CONCURRENCY", str(min(8, os.cpu_count() or 4))))
+
+# Blocking Bedrock calls run here rather than on the loop's default executor,
+# which is capped at min(32, cpu + 4) and shared with file I/O in admin.py.
+_BEDROCK_WORKERS = int(os.getenv("BEDROCK_WORKERS", "64"))
+_BEDROCK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_BEDROCK_WORKERS,
+    thread_name_prefix="bedrock",
+)
+
+# Successful designs are cached by a hash of everything that feeds the prompt,
+# so re-importing an unchanged agent skips Bedrock entirely.
+_DESIGN_CACHE_MAX = 1024
+_DESIGN_CACHE_TTL = float(os.getenv("DESIGNER_CACHE_TTL", "3600"))
+
 # Fields that the inspector reliably detects without LLM help
 _CONFIDENT_INPUT_FIELDS = {"messages", "query", "input", "user_input", "question", "text"}
 
@@ -139,6 +177,13 @@ class A2UIDesign(BaseModel):
     )
 
 
+class RefineReply(BaseModel):
+    # Validated straight from the reply text (model_validate_json), so a bad
+    # screen fails during the parse instead of after a full json.loads.
+    screens: Optional[Dict[str, ScreenDef]] = None
+    reasoning: str = "Screens updated."
+
+
 # ── Result dataclass ──────────────────────────────────────────────────────────
 
 @dataclass
@@ -154,11 +199,13 @@ class DesignResult:
 
 # ── Component validation ──────────────────────────────────────────────────────
 
-_KNOWN_COMPONENTS = {
+_REQUIRED_SCREENS = ("welcome", "result", "error")
+
+_KNOWN_COMPONENTS = frozenset({
     "Column", "Row", "Text", "DataCard", "BenefitCard", "Image",
     "Gauge", "StatCard", "ProgressBar", "ComparisonBadge", "ProductCard",
     "Timeline", "Button", "Map",
-}
+})
 
 
 def _validate_and_fix_components(
@@ -169,20 +216,22 @@ def _validate_and_fix_components(
     """
     Validate a component list and apply light auto-fixes.
     Returns (fixed_components, warning_list).
+
+    Fixes are applied to the component dicts in place: callers pass lists
+    freshly built by pydantic validation (ScreenDef.components), never
+    shared state.
     """
     warnings: List[str] = []
-    ids = {c.get("id") for c in components if isinstance(c, dict)}
+    child_ids = [c["id"] for c in components if isinstance(c, dict) and c.get("id")]
 
     # Ensure root exists
-    has_root = any(c.get("id") == "root" for c in components if isinstance(c, dict))
-    if not has_root:
+    if "root" not in child_ids:
         warnings.append(f"[{screen_key}] Missing root component — adding one.")
-        child_ids = [c.get("id") for c in components if isinstance(c, dict) and c.get("id")]
         components = [
             {"id": "root", "component": "Column", "children": child_ids},
             *components,
         ]
-        ids.add("root")
+    ids = frozenset(child_ids).union(("root",))
 
     fixed = []
     for comp in components:
@@ -204,14 +253,13 @@ def _validate_and_fix_components(
 
         # Check children references
         children = comp.get("children", [])
-        valid_children = [c for c in children if c in ids]
-        missing = set(children) - ids
+        missing = [c for c in children if c not in ids]
         if missing:
             warnings.append(
                 f"[{screen_key}] Component '{comp.get('id')}' references unknown children: "
-                f"{missing} — removed."
+                f"{set(missing)} — removed."
             )
-            comp = {**comp, "children": valid_children}
+            comp["children"] = [c for c in children if c in ids]
 
         fixed.append(comp)
 
@@ -230,6 +278,16 @@ def _validate_screen(screen: ScreenDef, plugin_id: str, key: str) -> Tuple[dict,
     }, warnings
 
 
+def _validate_screens(
+    screens: Dict[str, ScreenDef], plugin_id: str,
+) -> Tuple[Dict[str, dict], List[str]]:
+    """Validate every screen; warnings are flattened once at the end."""
+    validated = {key: _validate_screen(screen, plugin_id, key) for key, screen in screens.items()}
+    screens_out = {key: screen for key, (screen, _) in validated.items()}
+    warnings = list(chain.from_iterable(w for _, w in validated.values()))
+    return screens_out, warnings
+
+
 # ── Phase-1 fallback screens ──────────────────────────────────────────────────
 
 def _fallback_screens(plugin_id: str, agent_name: str) -> Dict[str, dict]:
@@ -285,6 +343,31 @@ outside the JSON structure.
 """
 
 
+@lru_cache(maxsize=256)
+def _format_inspection(
+    state_fields: Tuple[StateField, ...],
+    nodes: Tuple[NodeInfo, ...],
+    pydantic_models: Tuple[str, ...],
+) -> Tuple[str, str, str]:
+    """
+    Prompt text for the state fields, graph nodes and Pydantic models.
+
+    Cached on the (frozen, hashable) inspector values, so a refine loop or
+    Sonnet → Haiku retry over the same agent formats them only once.
+    """
+    state_fields_text = "\n".join(
+        f"  {sf.name}: {sf.annotation}" for sf in state_fields
+    ) or "  (none detected)"
+
+    nodes_text = "\n".join(
+        f"  {n.name}  →  {n.function}()" for n in nodes
+    ) or "  (none detected)"
+
+    pydantic_text = "  " + ", ".join(pydantic_models) if pydantic_models else "  (none)"
+
+    return state_fields_text, nodes_text, pydantic_text
+
+
 def _build_design_prompt(
     plugin_id: str,
     inspection: InspectionResult,
@@ -292,23 +375,14 @@ def _build_design_prompt(
     hinted_input_field: str,
     hinted_output_accessor: str,
 ) -> str:
-    state_fields_text = "\n".join(
-        f"  {f['name']}: {f['annotation']}"
-        for f in [{"name": sf.name, "annotation": sf.annotation} for sf in inspection.state_fields]
-    ) or "  (none detected)"
-
-    nodes_text = "\n".join(
-        f"  {n.name}  →  {n.function}()"
-        for n in inspection.nodes
-    ) or "  (none detected)"
-
-    pydantic_text = (
-        "  " + ", ".join(inspection.pydantic_models)
-        if inspection.pydantic_models else "  (none)"
+    state_fields_text, nodes_text, pydantic_text = _format_inspection(
+        tuple(inspection.state_fields),
+        tuple(inspection.nodes),
+        tuple(inspection.pydantic_models),
     )
 
     return f"""Plugin ID : {plugin_id}
-Agent name: {" ".join(w.capitalize() for w in plugin_id.split("_"))}
+Agent name: {agent_display_name(plugin_id)}
 
 README excerpt (agent purpose):
 {readme_excerpt or "(not available)"}
@@ -353,30 +427,109 @@ Fields:
 
 Source snippet:
 {snippet}
-
-Respond with JSON only:
-{{"input_field": "...", "output_accessor": "..."}}
 """
 
 
 # ── LLM call helpers ──────────────────────────────────────────────────────────
+#
+# The system prompts (with the component guide) are identical on every call,
+# so they are followed by a Bedrock cachePoint block: repeat calls read the
+# prefix from the prompt cache instead of re-processing it. Cache points are
+# only sent to Claude models; other model IDs configured via env get plain
+# prompts.
+
+def _supports_prompt_cache(model_id: str) -> bool:
+    return "anthropic.claude" in model_id
+
+
+def _cached_blocks(text: str, model_id: str) -> List[Dict[str, Any]]:
+    """Content blocks for text, followed by a cache point where supported."""
+    blocks: List[Dict[str, Any]] = [{"type": "text", "text": text}]
+    if _supports_prompt_cache(model_id):
+        blocks.append({"cachePoint": {"type": "default"}})
+    return blocks
+
 
-def _invoke_converse(model_id: str, system: str, user: str) -> str:
+def _build_messages(model_id: str, system: str, user: str, user_prefix: Optional[str] = None):
     """
-    Synchronous Bedrock Converse API call.
-    Returns the assistant's text response.
-    Raises on any Bedrock / network error.
+    [SystemMessage, HumanMessage] with cache points after the system prompt
+    and, when given, after user_prefix (a stable leading part of the user turn).
+    """
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    user_content: Any = user
+    if user_prefix:
+        user_content = _cached_blocks(user_prefix, model_id) + [{"type": "text", "text": user}]
+    return [
+        SystemMessage(content=_cached_blocks(system, model_id)),
+        HumanMessage(content=user_content),
+    ]
+
+
+def _log_usage(model_id: str, message: Any) -> None:
+    """Log token usage, including prompt-cache reads/writes, for one response."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    logger.info(
+        "[LLMDesigner] %s usage: input=%s cache_read=%s cache_write=%s output=%s",
+        model_id, usage.get("input_tokens"), details.get("cache_read"),
+        details.get("cache_creation"), usage.get("output_tokens"),
+    )
+
+
+@lru_cache(maxsize=1)
+def _bedrock_client():
     """
+    One bedrock-runtime client shared by every designer call.
+
+    botocore clients are thread-safe; the pool is sized to the Bedrock thread
+    pool, since botocore's default of 10 connections would throttle it.
+    """
+    import boto3
+    from botocore.config import Config
+
+    return boto3.Session().client(
+        "bedrock-runtime",
+        region_name=_AWS_REGION,
+        config=Config(
+            max_pool_connections=_BEDROCK_WORKERS,
+            retries={"mode": "adaptive", "max_attempts": 3},
+        ),
+    )
+
+
+@lru_cache(maxsize=16)
+def _get_llm(model_id: str):
     from langchain_aws import ChatBedrockConverse
 
-    llm = ChatBedrockConverse(
+    return ChatBedrockConverse(
         model=model_id,
+        client=_bedrock_client(),
         region_name=_AWS_REGION,
         max_tokens=4096,
         temperature=0,   # deterministic output for structured generation
     )
-    from langchain_core.messages import HumanMessage, SystemMessage
-    response = llm.invoke([SystemMessage(content=system), HumanMessage(content=user)])
+
+
+@lru_cache(maxsize=16)
+def _get_structured_llm(model_id: str, schema: Type[BaseModel]):
+    # Model classes hash by identity, so (model_id, schema) is the cache key
+    # directly; the tool definition (the schema's JSON schema) is built once
+    # per pair here rather than on every design call.
+    # include_raw keeps the AIMessage so cache usage can be logged.
+    return _get_llm(model_id).with_structured_output(schema, include_raw=True)
+
+
+def _invoke_converse(
+    model_id: str, system: str, user: str, user_prefix: Optional[str] = None,
+) -> str:
+    """
+    Synchronous Bedrock Converse API call.
+    Returns the assistant's text response.
+    Raises on any Bedrock / network error.
+    """
+    response = _get_llm(model_id).invoke(_build_messages(model_id, system, user, user_prefix))
+    _log_usage(model_id, response)
     return response.content if hasattr(response, "content") else str(response)
 
 
@@ -386,17 +539,39 @@ def _invoke_structured(model_id: str, system: str, user: str, schema) -> Any:
     Returns a validated Pydantic model instance.
     Raises ValidationError or any Bedrock error.
     """
-    from langchain_aws import ChatBedrockConverse
+    out = _get_structured_llm(model_id, schema).invoke(_build_messages(model_id, system, user))
+    _log_usage(model_id, out["raw"])
+    if out["parsing_error"] is not None:
+        raise out["parsing_error"]
+    return out["parsed"]
 
-    llm = ChatBedrockConverse(
-        model=model_id,
-        region_name=_AWS_REGION,
-        max_tokens=4096,
-        temperature=0,
+
+def _dumps_indented(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+# A leading ``` / ```json fence line and a trailing ``` fence.
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+
+
+def _strip_fences(raw: str) -> str:
+    """
+    Remove accidental markdown code fences around a JSON reply.
+
+    (str.lstrip("```json") strips a *character set*, which would also eat a
+    leading "j", "s", "o" or "n" of unfenced output.)
+    """
+    return _FENCE_RE.sub("", raw).strip()
+
+
+async def _to_bedrock_thread(fn, /, *args):
+    """asyncio.to_thread() on _BEDROCK_EXECUTOR, keeping contextvars intact."""
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _BEDROCK_EXECUTOR, functools.partial(ctx.run, fn, *args)
     )
-    structured_llm = llm.with_structured_output(schema)
-    from langchain_core.messages import HumanMessage, SystemMessage
-    return structured_llm.invoke([SystemMessage(content=system), HumanMessage(content=user)])
 
 
 # ── Pass 1: Field mapping (Haiku) ─────────────────────────────────────────────
@@ -422,14 +597,12 @@ def _map_fields_sync(inspection: InspectionResult) -> Tuple[str, str]:
         fields=fields_text,
         snippet=inspection.source_snippet[:600],
     )
-    system = "You identify LangGraph state field mappings. Respond with JSON only."
+    system = "You identify LangGraph state field mappings."
 
     try:
-        raw = _invoke_converse(_DEFAULT_HAIKU, system, prompt)
-        # Strip any accidental markdown fences
-        raw = raw.strip().lstrip("```json").lstrip("```").rstrip("```").strip()
-        data = json.loads(raw)
-        mapping = FieldMapping.model_validate(data)
+        # Structured output: FieldMapping (and its field descriptions) is the
+        # tool schema, so the reply arrives already validated.
+        mapping = _invoke_structured(_DEFAULT_HAIKU, system, prompt, FieldMapping)
         logger.info("[LLMDesigner] Haiku field mapping: %s → %s",
                     mapping.input_field, mapping.output_accessor)
         return mapping.input_field, mapping.output_accessor
@@ -487,37 +660,48 @@ def _refine_sync(
     readme_excerpt: str,
     model_id: str,
 ) -> DesignResult:
-    agent_name = " ".join(w.capitalize() for w in plugin_id.split("_"))
-    user_prompt = (
+    agent_name = agent_display_name(plugin_id)
+    # The agent context and current screens lead the user turn and get their
+    # own cache point, so a retry or repeated request over the same screens
+    # reuses the cached prefix; only the request itself varies.
+    context_prompt = (
         f"Plugin ID: {plugin_id}\n"
         f"Agent description: {readme_excerpt or '(not available)'}\n\n"
-        f"Current screens:\n{json.dumps(current_screens, indent=2)}\n\n"
+        f"Current screens:\n{_dumps_indented(current_screens)}\n\n"
+    )
+    request_prompt = (
         f"User request: {user_request}\n\n"
         "Update the screens to satisfy the request. Return all screens (including unchanged ones)."
     )
 
-    raw = _invoke_converse(model_id, _REFINE_SYSTEM_PROMPT, user_prompt)
-    raw = raw.strip().lstrip("```json").lstrip("```").rstrip("```").strip()
-    data = json.loads(raw)
+    raw = _invoke_converse(
+        model_id, _REFINE_SYSTEM_PROMPT, request_prompt, user_prefix=context_prompt
+    )
+    reply = RefineReply.model_validate_json(_strip_fences(raw))
 
-    screens_raw = data.get("screens", current_screens)
-    reasoning = data.get("reasoning", "Screens updated.")
+    if reply.screens is not None:
+        # The prompt asks for every screen back; a reply missing a mandatory
+        # one is treated as a failed attempt (refine() retries with Haiku)
+        # before any per-screen fix-up work is done.
+        missing = [k for k in _REQUIRED_SCREENS if k not in reply.screens]
+        if missing:
+            raise ValueError(f"incomplete refine response: missing screens {missing}")
+        screen_defs = reply.screens
+    else:
+        screen_defs = {
+            key: ScreenDef.model_validate(screen_raw)
+            for key, screen_raw in current_screens.items()
+            if isinstance(screen_raw, dict)
+        }
 
-    all_warnings: List[str] = []
-    screens_out: Dict[str, dict] = {}
-    for key, screen_raw in screens_raw.items():
-        if isinstance(screen_raw, dict):
-            screen_def = ScreenDef.model_validate(screen_raw)
-            screen_dict, comp_warnings = _validate_screen(screen_def, plugin_id, key)
-            screens_out[key] = screen_dict
-            all_warnings.extend(comp_warnings)
+    screens_out, all_warnings = _validate_screens(screen_defs, plugin_id)
 
     # Ensure mandatory screens are present (fall back to current or defaults)
-    for required_key in ("welcome", "result", "error"):
-        if required_key not in screens_out:
-            screens_out[required_key] = current_screens.get(
-                required_key, _fallback_screens(plugin_id, agent_name)[required_key]
-            )
+    missing = [k for k in _REQUIRED_SCREENS if k not in screens_out]
+    if missing:
+        fallback = _fallback_screens(plugin_id, agent_name)
+        for required_key in missing:
+            screens_out[required_key] = current_screens.get(required_key, fallback[required_key])
 
     if all_warnings:
         logger.warning("[LLMDesigner] Refine component warnings: %s", all_warnings)
@@ -527,7 +711,7 @@ def _refine_sync(
         input_field="messages",
         output_accessor="messages[-1].content",
         initial_domain_state={},
-        reasoning=reasoning,
+        reasoning=reply.reasoning,
         used_fallback=False,
     )
 
@@ -548,11 +732,11 @@ async def refine(
     for model_label, model_id in [("Sonnet", sonnet_model_id), ("Haiku", haiku_model_id)]:
         try:
             logger.info("[LLMDesigner] Refine with %s (%s)", model_label, model_id)
-            result = await asyncio.to_thread(
+            result = await _to_bedrock_thread(
                 _refine_sync, plugin_id, current_screens, user_request, readme_excerpt, model_id
             )
             logger.info("[LLMDesigner] Refine complete (%s). Screens: %s",
-                        model_label, list(result.screens.keys()))
+                        model_label, result.screens.keys())
             return result
         except Exception as exc:
             logger.warning("[LLMDesigner] Refine %s failed: %s — %s", model_label, type(exc).__name__, exc)
@@ -569,6 +753,31 @@ async def refine(
     )
 
 
+# ── Design cache ──────────────────────────────────────────────────────────────
+
+# key → (expires_at, DesignResult); insertion order doubles as LRU order.
+_design_cache: "OrderedDict[str, Tuple[float, DesignResult]]" = OrderedDict()
+
+
+def _design_cache_key(
+    plugin_id: str,
+    inspection: InspectionResult,
+    readme_excerpt: str,
+    sonnet_model_id: str,
+    haiku_model_id: str,
+) -> str:
+    payload = json.dumps([
+        plugin_id,
+        sonnet_model_id,
+        haiku_model_id,
+        [(sf.name, sf.annotation) for sf in inspection.state_fields],
+        [n.name for n in inspection.nodes],
+        inspection.source_snippet[:2000],
+        readme_excerpt[:2000],
+    ])
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
 # ── Public async entry point ──────────────────────────────────────────────────
 
 async def design(
@@ -584,44 +793,72 @@ async def design(
     Fallback chain:
       Sonnet → Haiku → Phase-1 minimal defaults
 
-    Never raises; always returns a usable DesignResult.
+    Never raises; always returns a usable DesignResult. Successful (non-fallback)
+    results are cached for DESIGNER_CACHE_TTL seconds; callers get a copy.
     """
-    agent_name = " ".join(w.capitalize() for w in plugin_id.split("_"))
-    all_warnings: List[str] = []
-
-    # ── Pass 1: Field mapping ─────────────────────────────────────────────────
-    try:
-        input_field, output_accessor = await asyncio.to_thread(
-            _map_fields_sync, inspection
+    key = _design_cache_key(plugin_id, inspection, readme_excerpt,
+                            sonnet_model_id, haiku_model_id)
+    hit = _design_cache.get(key)
+    if hit is not None:
+        expires_at, cached = hit
+        if expires_at > time.monotonic():
+            _design_cache.move_to_end(key)
+            logger.info("[LLMDesigner] Design cache hit for %s", plugin_id)
+            return copy.deepcopy(cached)
+        del _design_cache[key]
+
+    result = await _design(plugin_id, inspection, readme_excerpt,
+                           sonnet_model_id, haiku_model_id)
+    if not result.used_fallback:
+        _design_cache[key] = (time.monotonic() + _DESIGN_CACHE_TTL, copy.deepcopy(result))
+        if len(_design_cache) > _DESIGN_CACHE_MAX:
+            _design_cache.popitem(last=False)
+    return result
+
+
+async def _design(
+    plugin_id: str,
+    inspection: InspectionResult,
+    readme_excerpt: str,
+    sonnet_model_id: str,
+    haiku_model_id: str,
+) -> DesignResult:
+    agent_name = agent_display_name(plugin_id)
+
+    async def _attempt(model_label: str, model_id: str,
+                       input_field: str, output_accessor: str) -> A2UIDesign:
+        logger.info("[LLMDesigner] Calling %s (%s) for A2UI design", model_label, model_id)
+        result = await _to_bedrock_thread(
+            _design_sync, plugin_id, inspection, readme_excerpt,
+            input_field, output_accessor, model_id,
         )
-    except Exception as exc:
-        logger.warning("[LLMDesigner] Field mapping thread error: %s", exc)
-        input_field = inspection.detected_input_field
-        output_accessor = inspection.detected_output_field
-
-    # ── Pass 2: Design (Sonnet) ───────────────────────────────────────────────
+        logger.info("[LLMDesigner] %s design complete. Screens: %s",
+                    model_label, result.screens.keys())
+        return result
+
+    # ── Pass 2 (Sonnet → Haiku) ──────────────────────────────────────────────
+    # The design schema carries input_field / output_accessor itself and the
+    # prompt lets the model override the inspector's hints, so neither design
+    # attempt waits on Pass 1.
+    hinted_input = inspection.detected_input_field
+    hinted_output = inspection.detected_output_field
     design_result: Optional[A2UIDesign] = None
     fallback_reason: Optional[str] = None
 
-    for model_label, model_id in [("Sonnet", sonnet_model_id), ("Haiku", haiku_model_id)]:
+    for model_label, model_id in (("Sonnet", sonnet_model_id), ("Haiku", haiku_model_id)):
         try:
-            logger.info("[LLMDesigner] Calling %s (%s) for A2UI design", model_label, model_id)
-            design_result = await asyncio.to_thread(
-                _design_sync, plugin_id, inspection, readme_excerpt,
-                input_field, output_accessor, model_id,
-            )
-            logger.info("[LLMDesigner] %s design complete. Screens: %s",
-                        model_label, list(design_result.screens.keys()))
+            design_result = await _attempt(model_label, model_id, hinted_input, hinted_output)
             break
         except Exception as exc:
             fallback_reason = f"{model_label} failed: {exc}"
             logger.warning("[LLMDesigner] %s design failed: %s — %s",
                            model_label, type(exc).__name__, exc)
-            if model_label == "Haiku":
-                logger.warning("[LLMDesigner] All LLM attempts failed — using Phase-1 defaults")
 
     # ── Fallback to Phase-1 defaults ─────────────────────────────────────────
+    # Pass 1 (field mapping) only runs here, where no design supplied fields.
     if design_result is None:
+        logger.warning("[LLMDesigner] All LLM attempts failed — using Phase-1 defaults")
+        input_field, output_accessor = await _to_bedrock_thread(_map_fields_sync, inspection)
         return DesignResult(
             screens=_fallback_screens(plugin_id, agent_name),
             input_field=input_field,
@@ -633,19 +870,17 @@ async def design(
         )
 
     # ── Validate and fix components ───────────────────────────────────────────
-    screens_out: Dict[str, dict] = {}
-    for key, screen_def in design_result.screens.items():
-        screen_dict, comp_warnings = _validate_screen(screen_def, plugin_id, key)
-        screens_out[key] = screen_dict
-        all_warnings.extend(comp_warnings)
+    screens_out, all_warnings = _validate_screens(design_result.screens, plugin_id)
 
     # Ensure mandatory screens exist
-    for required_key in ("welcome", "result", "error"):
-        if required_key not in screens_out:
+    missing = [k for k in _REQUIRED_SCREENS if k not in screens_out]
+    if missing:
+        fallback = _fallback_screens(plugin_id, agent_name)
+        for required_key in missing:
             all_warnings.append(
                 f"Screen '{required_key}' missing from LLM response — using fallback."
             )
-            screens_out[required_key] = _fallback_screens(plugin_id, agent_name)[required_key]
+            screens_out[required_key] = fallback[required_key]
 
     if all_warnings:
         logger.warning("[LLMDesigner] Component warnings: %s", all_warnings)
@@ -658,3 +893,24 @@ async def design(
         reasoning=design_result.reasoning,
         used_fallback=False,
     )
+
+
+async def design_batch(
+    items: List[Tuple[str, InspectionResult, str]],
+    *,
+    max_concurrency: int = _MAX_CONCURRENCY,
+) -> List[DesignResult]:
+    """
+    Run design() over several (plugin_id, inspection, readme_excerpt) items.
+
+    At most max_concurrency designs are in flight at once; results come back
+    in input order. Each in-flight design holds one Bedrock pool worker, so
+    keep max_concurrency at or below BEDROCK_WORKERS. Never raises, like design().
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(plugin_id: str, inspection: InspectionResult, readme_excerpt: str) -> DesignResult:
+        async with sem:
+            return await design(plugin_id, inspection, readme_excerpt)
+
+    return list(await asyncio.gather(*(_one(*item) for item in items)))
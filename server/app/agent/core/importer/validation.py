@@ -0,0 +1,114 @@
+"""
+validation.py — Child-process checks for a freshly generated plugin.
+
+admin.py runs validate() in a short-lived multiprocessing child (forkserver
+context where available) instead of launching `python -c ...`. The generated
+plugin is only ever imported in the child, so a broken plugin cannot poison the
+server's own module cache, and a crash or hang is contained to the child.
+
+validate() reports back over the write end of a one-way Pipe: one message for
+the import stage and, if that passed, one for the smoke test.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+import traceback
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # plugin venvs without orjson fall back to stdlib json
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+# validation.py lives at server/app/agent/core/importer/ → server/ is four levels up.
+_SERVER_DIR = Path(__file__).resolve().parents[4]
+
+
+def _enter_server_dir() -> None:
+    """Match the old subprocess setup: cwd=server/ with server/ on sys.path."""
+    os.chdir(_SERVER_DIR)
+    if str(_SERVER_DIR) not in sys.path:
+        sys.path.insert(0, str(_SERVER_DIR))
+
+
+def _load_plugin(plugin_id: str, plugin_class_name: str):
+    module = importlib.import_module(f"app.agent.plugins.{plugin_id}.plugin")
+    plugin = getattr(module, plugin_class_name)()
+    if plugin.plugin_id != plugin_id:
+        raise AssertionError(
+            f"plugin_id mismatch: expected {plugin_id!r}, got {plugin.plugin_id!r}"
+        )
+    return plugin
+
+
+def _safe_event(e: dict) -> dict:
+    """Truncate large component payloads for safe JSON serialisation."""
+    e = dict(e)
+    if "payload" in e and isinstance(e["payload"], dict):
+        p = dict(e["payload"])
+        if "updateComponents" in p and isinstance(p.get("updateComponents"), dict):
+            comps = p["updateComponents"].get("components", [])
+            p["updateComponents"] = {"component_count": len(comps), "first": comps[:2]}
+        if "text" in p:
+            p["text"] = p["text"][:120]
+        e["payload"] = p
+    return e
+
+
+def _smoke_test(plugin) -> str:
+    """
+    Invoke the plugin's graph with an empty transcript (welcome screen path).
+
+    Returns a JSON string describing the outbox; encoding to JSON in the child
+    keeps arbitrary graph objects out of the pickle channel.
+    """
+    state = plugin.create_initial_state()
+    state["transcript"] = ""        # empty → welcome screen, no external graph call
+    state["pendingAction"] = None
+
+    graph = plugin.build_graph()
+    result = graph.invoke(state, {})
+    outbox = result.get("outbox", [])
+
+    return _dumps({
+        "ok": True,
+        "outbox_count": len(outbox),
+        "has_a2ui": any(e.get("type") == "server.a2ui.patch" for e in outbox),
+        "has_voice": any(e.get("type") == "server.voice.say" for e in outbox),
+        "outbox_sample": [_safe_event(e) for e in outbox[:3]],
+    })
+
+
+def validate(plugin_id: str, plugin_class_name: str, conn) -> None:
+    """
+    Import check followed by smoke test, sharing one child and one plugin import.
+
+    Sends ("import_ok", None) or ("import_err", traceback) first; after a
+    successful import, sends ("smoke_ok", json) or ("smoke_err", traceback).
+    """
+    try:
+        try:
+            _enter_server_dir()
+            plugin = _load_plugin(plugin_id, plugin_class_name)
+        except BaseException:
+            conn.send(("import_err", traceback.format_exc()))
+            return
+        conn.send(("import_ok", None))
+
+        try:
+            conn.send(("smoke_ok", _smoke_test(plugin)))
+        except BaseException:
+            conn.send(("smoke_err", traceback.format_exc()))
+    finally:
+        conn.close()
@@ -3,12 +3,18 @@ registry.py — Plugin registration and lookup.
 
 Plugins register themselves at import time. The runtime calls get_plugin()
 with an agent_id string to retrieve the correct plugin for a session.
+
+Registration only happens at startup, so main.py calls freeze_registry() once
+plugins are loaded: lookups then read an immutable snapshot and
+list_plugins() returns a cached tuple instead of building a new list.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Dict
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 
 from app.agent.core.contracts import PluginBase
 
@@ -17,14 +23,28 @@ logger = logging.getLogger(__name__)
 # Module-level registry — populated by register() calls in main.py startup.
 _registry: Dict[str, PluginBase] = {}
 
+# Read-only snapshot published by freeze_registry().
+_frozen: Optional[Mapping[str, PluginBase]] = None
+_id_tuple: Optional[Tuple[str, ...]] = None
+
 
 def register(plugin: PluginBase) -> None:
     """Register a plugin instance. Overwrites any existing entry for the same plugin_id."""
-    _registry[plugin.plugin_id] = plugin
+    _registry[sys.intern(plugin.plugin_id)] = plugin
+    if _frozen is not None:
+        # Late registration (tests, reloads) republishes the snapshot.
+        freeze_registry()
     logger.info("[AgentRegistry] Registered plugin: %s (state_version=%d)",
                 plugin.plugin_id, plugin.state_version)
 
 
+def freeze_registry() -> None:
+    """Publish a read-only snapshot of the registry for lock-free lookups."""
+    global _frozen, _id_tuple
+    _frozen = MappingProxyType(dict(_registry))
+    _id_tuple = tuple(_registry)
+
+
 def get_plugin(agent_id: str) -> PluginBase:
     """
     Return the registered plugin for agent_id.
@@ -32,9 +52,10 @@ def get_plugin(agent_id: str) -> PluginBase:
     Raises KeyError if agent_id is not registered, so callers can catch
     and close the WebSocket with a 4000 code (see main.py).
     """
-    plugin = _registry.get(agent_id)
+    plugins = _frozen if _frozen is not None else _registry
+    plugin = plugins.get(agent_id)
     if plugin is None:
-        available = list(_registry.keys())
+        available = list(plugins)
         raise KeyError(
             f"No plugin registered for agent_id={agent_id!r}. "
             f"Available: {available}"
@@ -42,6 +63,8 @@ def get_plugin(agent_id: str) -> PluginBase:
     return plugin
 
 
-def list_plugins() -> list:
+def list_plugins() -> Tuple[str, ...]:
     """Return registered plugin IDs — useful for health checks."""
-    return list(_registry.keys())
+    if _id_tuple is not None:
+        return _id_tuple
+    return tuple(_registry)
@@ -2,19 +2,51 @@
 runtime_adapter.py — Thin async wrapper around graph.invoke.
 
 Keeps the event loop unblocked by running the synchronous LangGraph
-invoke on a thread pool via asyncio.to_thread.
+invoke on a dedicated thread pool (GRAPH_WORKERS threads), with the caller's
+contextvars copied in as asyncio.to_thread would.
+
+Compiled graphs are cached per (plugin_id, state_version), so build_graph()
+runs once per plugin rather than on every turn. invalidate_graph() drops a
+plugin's entry, e.g. after it is reloaded.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import functools
 import logging
-from typing import Any, Dict
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Tuple
 
 from app.agent.core.contracts import PluginBase
 
 logger = logging.getLogger(__name__)
 
+_GRAPH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GRAPH_WORKERS", "64")),
+    thread_name_prefix="graph",
+)
+
+_graph_cache: Dict[Tuple[str, int], Any] = {}
+
+
+def _get_graph(plugin: PluginBase) -> Any:
+    # No lock needed: build_graph() is synchronous, so nothing else on the
+    # event loop can interleave between the lookup and the store.
+    key = (plugin.plugin_id, plugin.state_version)
+    graph = _graph_cache.get(key)
+    if graph is None:
+        graph = _graph_cache[key] = plugin.build_graph()
+    return graph
+
+
+def invalidate_graph(plugin_id: str) -> None:
+    """Forget the cached graph(s) for plugin_id; the next invoke rebuilds."""
+    for key in [k for k in _graph_cache if k[0] == plugin_id]:
+        del _graph_cache[key]
+
 
 async def invoke_graph(
     plugin: PluginBase,
@@ -27,9 +59,12 @@ async def invoke_graph(
     Returns the new state dict produced by the graph.
     Propagates any exception raised by the graph (caller must handle).
     """
-    graph = plugin.build_graph()
+    graph = _get_graph(plugin)
     logger.debug("[RuntimeAdapter] Invoking graph for plugin=%s", plugin.plugin_id)
-    result = await asyncio.to_thread(graph.invoke, state, config)
+    ctx = contextvars.copy_context()
+    result = await asyncio.get_running_loop().run_in_executor(
+        _GRAPH_EXECUTOR, functools.partial(ctx.run, graph.invoke, state, config)
+    )
     logger.debug("[RuntimeAdapter] Graph invoke complete for plugin=%s", plugin.plugin_id)
     plugin.post_invoke(result)
     return result
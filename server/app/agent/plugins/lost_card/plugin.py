@@ -22,43 +22,34 @@ class LostCardPlugin(PluginBase):
         from app.agent.plugins.lost_card.graph import app_graph
         return app_graph
 
+    _INITIAL_TEMPLATE = {
+        **PluginBase._INITIAL_TEMPLATE,
+        # ── Domain data ───────────────────────────────────────────────────
+        "domain": {
+            "lost_card": {
+                "card_status": "active",
+                "card_last4": None,
+                "freeze_confirmed": False,
+                "replacement_requested": False,
+                "replacement_eta": None,
+                "identity_verified": False,
+                "risk_level": "low",
+                "suspicious_tx": [],
+                "branch_requested": False,
+                "escalation_required": False,
+                "audit_log": [],
+            },
+        },
+    }
+
     def create_initial_state(self) -> Dict[str, Any]:
         from app.agent.plugins.lost_card.persistence import load_domain
 
-        defaults: Dict[str, Any] = {
-            "card_status": "active",
-            "card_last4": None,
-            "freeze_confirmed": False,
-            "replacement_requested": False,
-            "replacement_eta": None,
-            "identity_verified": False,
-            "risk_level": "low",
-            "suspicious_tx": [],
-            "branch_requested": False,
-            "escalation_required": False,
-            "audit_log": [],
-        }
-
+        state = super().create_initial_state()
         # Merge persisted domain on top of defaults so returning customers
         # see their card's actual status after a hard refresh.
-        persisted = load_domain()
-        domain = {**defaults, **persisted}
-
-        return {
-            # ── CommonState envelope ──────────────────────────────────────
-            "mode": "text",
-            "device": "desktop",
-            "transcript": "",
-            "messages": [],
-            "ui": {"surfaceId": "main", "state": "LOADING"},
-            "errors": None,
-            "pendingAction": None,
-            "outbox": [],
-            "meta": {},
-            "state_version": self.state_version,
-            # ── Domain data ───────────────────────────────────────────────
-            "domain": {"lost_card": domain},
-        }
+        state["domain"]["lost_card"].update(load_domain())
+        return state
 
     def post_invoke(self, state: Dict[str, Any]) -> None:
         """Persist domain state after every graph turn."""
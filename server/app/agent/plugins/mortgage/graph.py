@@ -4,6 +4,7 @@ import json
 import logging
 import urllib.request
 import urllib.parse
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional, TypedDict, Annotated
 import operator
@@ -18,6 +19,31 @@ logger = logging.getLogger(__name__)
 # Falls back to the repository root resolved relative to this file's location.
 _ASSETS_DIR = os.getenv("ASSETS_DIR", str(Path(__file__).resolve().parents[5]))
 
+
+# Public base URL of the server (e.g. http://localhost:8000). When set, icons
+# are linked to main.py's GET /icons/{name}.png, which the browser caches,
+# instead of inlining every PNG as base64 in each options-dashboard patch.
+_ICON_BASE_URL = os.getenv("ICON_BASE_URL", "").rstrip("/")
+
+
+def _load_icon_url(name: str) -> str:
+    """Icon URL for an asset name: served URL, or a data: URL read from <name>_b64.txt."""
+    if _ICON_BASE_URL:
+        return f"{_ICON_BASE_URL}/icons/{name}.png"
+    try:
+        with open(os.path.join(_ASSETS_DIR, f"{name}_b64.txt"), "r") as f:
+            icon = f.read().strip()
+    except OSError:
+        icon = ""
+    return f"data:image/png;base64,{icon}"
+
+
+# Resolved at import so render_missing_inputs does no disk I/O per turn.
+_FTB_ICON_URL = _load_icon_url("ftb")
+_REMORTGAGE_ICON_URL = _load_icon_url("remortgage")
+_BTL_ICON_URL = _load_icon_url("btl")
+_MOVING_ICON_URL = _load_icon_url("moving")
+
 def append_reducer(a: list, b: list) -> list:
     return a + b
 
@@ -225,11 +251,10 @@ def _answer_process_question(question: str, intent: dict, current_stage: str) ->
     if not (os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_PROFILE")):
         return _faq_fallback(question)
     try:
-        from langchain_aws import ChatBedrockConverse
         from langchain_core.messages import HumanMessage, SystemMessage
 
         model_id = os.getenv("AGENT_MODEL_ID", "amazon.nova-lite-v1:0")
-        llm = ChatBedrockConverse(model=model_id, region_name=os.getenv("AWS_REGION", "us-east-1"))
+        llm = _get_llm(model_id, os.getenv("AWS_REGION", "us-east-1"))
 
         known = {k: v for k, v in intent.items() if v is not None and k not in ("lat", "lng", "notes")}
         system_prompt = (
@@ -289,6 +314,8 @@ def _intent(state: dict) -> dict:
 
 
 # ─── Agent State ───────────────────────────────────────────────────────────────
+# A TypedDict (plain dict at runtime) by contract: create_initial_state(),
+# main.py's session store and graph.invoke() results all exchange dicts.
 
 class AgentState(TypedDict):
     # ── CommonState envelope (shared with all plugins) ───────────────────
@@ -322,6 +349,45 @@ class MortgageIntent(BaseModel):
     processQuestion: Optional[str] = Field(description="If the user is asking a question about the mortgage process (documents needed, timeline, what AiP means, fees, next steps, LTV, solicitors, overpayments, etc.), capture the question verbatim here. Leave null if they are just providing data.", default=None)
 
 
+# ─── Bedrock clients ──────────────────────────────────────────────────────────
+# Built once per (model_id, region) and reused across turns: constructing
+# ChatBedrockConverse creates a boto3 client, and with_structured_output
+# derives the tool schema from MortgageIntent.
+
+# Bedrock latency-optimized inference. Opt-in: only some models/regions
+# support it, and an unsupported model fails the call (each caller already
+# falls back to keyword parsing or template text).
+_LATENCY_OPTIMIZED = os.getenv("AGENT_LATENCY_OPTIMIZED") == "1"
+
+
+# Opt-in response cache for intent extraction: an identical prompt (same
+# history, known intent and transcript) is answered without a Bedrock call.
+# Only the intent model uses it; conversational replies stay uncached.
+_INTENT_CACHE_ENABLED = os.getenv("AGENT_INTENT_CACHE") == "1"
+
+
+@lru_cache(maxsize=8)
+def _get_llm(model_id: str, region: str, cached: bool = False):
+    from langchain_aws import ChatBedrockConverse
+
+    cache = None
+    if cached:
+        from langchain_core.caches import InMemoryCache
+        cache = InMemoryCache(maxsize=1024)
+    return ChatBedrockConverse(
+        model=model_id,
+        region_name=region,
+        performance_config={"latency": "optimized"} if _LATENCY_OPTIMIZED else None,
+        cache=cache,
+    )
+
+
+@lru_cache(maxsize=8)
+def _get_intent_llm(model_id: str, region: str):
+    llm = _get_llm(model_id, region, cached=_INTENT_CACHE_ENABLED)
+    return llm.with_structured_output(MortgageIntent)
+
+
 # ─── Nodes ────────────────────────────────────────────────────────────────────
 
 def ingest_input(state: AgentState):
@@ -329,6 +395,44 @@ def ingest_input(state: AgentState):
     return {}
 
 
+# Constant tail of the interpret_intent extraction prompt.
+_INTENT_RULES = (
+    "Rules:\n"
+    "- ONLY extract fields that are explicitly mentioned or clearly answered in the LATEST USER MESSAGE.\n"
+    "- IMPORTANT: Do NOT guess, assume, or provide default values for fields like propertyValue, annualIncome, or loanBalance if not stated.\n"
+    "- If the user says 'Number One [Street]' or 'First House', do NOT interpret 'one' as fixYears or propertyValue; it is part of the address.\n"
+    "- Interpret short answers (yes/no/yeah/nope) using the 'Context' provided above.\n"
+    "- Note that spoken currency may lack thousands indicators. If a user says '350' for a property value or income, it almost certainly means '350,000' or similar scale depending on context. Phrases like 'around a hundred thousand' should be extracted as 100000.\n"
+    "- If the user mentions applying with a partner, set 'isJoint' to true.\n"
+    "- If they share life feelings (excited, nervous), capture it in 'notes'.\n"
+    "- If they are just being conversational ('okay', 'thanks'), leave all fields as they were. Do NOT clear existing fields.\n"
+    "- If the user provides a postcode (especially if they spell it out phonetically like 's for sugar'), extract it into the 'address' field. Recognize that 'for' often precedes a phonetic word (e.g., 't for tango' means 'T').\n"
+    "- If the user is giving a property address and postcode, combine them into 'address'.\n"
+    "- If the user explicitly asks to skip, move on, or says they do not know the postcode or address, set 'address' to 'Skipped' so we can proceed.\n"
+    "- IMPORTANT: If the user says an existing value is wrong, or explicitly corrects a value (e.g., 'no that's my income, not the property value'), MUST update the appropriate field with the correct value AND REMOVE/NULLIFY the incorrectly assigned field, or replace it if they provide the correct value for it. DO NOT ignore explicit corrections.\n"
+    "- STRICT ISOLATION: When the user corrects ONE specific field (e.g., correcting their income), ONLY change that specific field. Do NOT accidentally overwrite other fields (like propertyValue) with the new number.\n"
+    "- DO NOT change any field that already has a value UNLESS the user is explicitly CORRECTING it.\n"
+)
+
+
+# Keyword fallback for interpret_intent (no AWS). Plain substring alternations,
+# matching the original `any(w in transcript.lower() ...)` checks in one scan.
+_CUSTOMER_YES_RE = re.compile(r"yes|yeah|yep|do|i am|i do|it is", re.IGNORECASE)
+_CUSTOMER_NO_RE = re.compile(r"no|nope|don't|dont|not", re.IGNORECASE)
+_SEEN_YES_RE = re.compile(r"yes|yeah|yep|found|seen|have", re.IGNORECASE)
+_SEEN_NO_RE = re.compile(r"no|nope|not yet|haven't", re.IGNORECASE)
+_BARE_YES_NO_RE = re.compile(r"(yes|yeah|yep|no|nope)[\s.!]*", re.IGNORECASE)
+
+
+def _yes_no_question(intent: dict):
+    """(field, yes_re, no_re) for the yes/no question being asked, or None."""
+    if intent.get("existingCustomer") is None:
+        return "existingCustomer", _CUSTOMER_YES_RE, _CUSTOMER_NO_RE
+    if intent.get("propertySeen") is None:
+        return "propertySeen", _SEEN_YES_RE, _SEEN_NO_RE
+    return None
+
+
 def interpret_intent(state: AgentState):
     transcript = state.get("transcript", "").strip()
     logger.info(f"NODE: interpret_intent - input='{transcript}'")
@@ -359,17 +463,24 @@ def interpret_intent(state: AgentState):
     elif intent.get("address") is None:
         last_question_context = "The last question asked was about the property address."
 
-    if os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_PROFILE"):
+    # Fast path: a bare yes/no to one of the yes/no questions is answered by
+    # the keyword parser exactly as the LLM would be told to read it, so skip
+    # the Bedrock round trip. Only words that question's own patterns
+    # recognise qualify, so the fast path always sets the field.
+    yes_no = _yes_no_question(intent)
+    bare = _BARE_YES_NO_RE.fullmatch(transcript)
+    bare_yes_no = (
+        yes_no is not None
+        and bare is not None
+        and (yes_no[1].search(bare[1]) or yes_no[2].search(bare[1])) is not None
+    )
+
+    if (os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_PROFILE")) and not bare_yes_no:
         try:
-            from langchain_aws import ChatBedrockConverse
             from langchain_core.messages import HumanMessage
 
             model_id = os.getenv("AGENT_MODEL_ID", "amazon.nova-lite-v1:0")
-            llm = ChatBedrockConverse(
-                model=model_id,
-                region_name=os.getenv("AWS_REGION", "us-east-1")
-            )
-            structured_llm = llm.with_structured_output(MortgageIntent)
+            structured_llm = _get_intent_llm(model_id, os.getenv("AWS_REGION", "us-east-1"))
 
             lc_messages = []
             for msg in messages[:-2]:  # exclude last 2 which are already in the prompt
@@ -383,27 +494,17 @@ def interpret_intent(state: AgentState):
                 f"Device: {device}\n"
                 f"Current known intent: {intent}\n"
                 f"User just said: '{transcript}'\n\n"
-                "Rules:\n"
-                "- ONLY extract fields that are explicitly mentioned or clearly answered in the LATEST USER MESSAGE.\n"
-                "- IMPORTANT: Do NOT guess, assume, or provide default values for fields like propertyValue, annualIncome, or loanBalance if not stated.\n"
-                "- If the user says 'Number One [Street]' or 'First House', do NOT interpret 'one' as fixYears or propertyValue; it is part of the address.\n"
-                "- Interpret short answers (yes/no/yeah/nope) using the 'Context' provided above.\n"
-                "- Note that spoken currency may lack thousands indicators. If a user says '350' for a property value or income, it almost certainly means '350,000' or similar scale depending on context. Phrases like 'around a hundred thousand' should be extracted as 100000.\n"
-                "- If the user mentions applying with a partner, set 'isJoint' to true.\n"
-                "- If they share life feelings (excited, nervous), capture it in 'notes'.\n"
-                "- If they are just being conversational ('okay', 'thanks'), leave all fields as they were. Do NOT clear existing fields.\n"
-                "- If the user provides a postcode (especially if they spell it out phonetically like 's for sugar'), extract it into the 'address' field. Recognize that 'for' often precedes a phonetic word (e.g., 't for tango' means 'T').\n"
-                "- If the user is giving a property address and postcode, combine them into 'address'.\n"
-                "- If the user explicitly asks to skip, move on, or says they do not know the postcode or address, set 'address' to 'Skipped' so we can proceed.\n"
-                "- IMPORTANT: If the user says an existing value is wrong, or explicitly corrects a value (e.g., 'no that's my income, not the property value'), MUST update the appropriate field with the correct value AND REMOVE/NULLIFY the incorrectly assigned field, or replace it if they provide the correct value for it. DO NOT ignore explicit corrections.\n"
-                "- STRICT ISOLATION: When the user corrects ONE specific field (e.g., correcting their income), ONLY change that specific field. Do NOT accidentally overwrite other fields (like propertyValue) with the new number.\n"
-                "- DO NOT change any field that already has a value UNLESS the user is explicitly CORRECTING it.\n"
+                + _INTENT_RULES
             )
             lc_messages.append(HumanMessage(content=current_prompt))
 
             result = structured_llm.invoke(lc_messages)
-            idict = result.model_dump(exclude_none=True)
+            # Every MortgageIntent field defaults to None, so this equals
+            # model_dump(exclude_none=True) without the serializer pass.
+            idict = {k: v for k, v in result if v is not None}
 
+            # A copy, not intent.update(): intent is the dict stored in
+            # domain state, and the address checks below compare against it.
             new_intent = {**intent, **idict}
         except Exception as e:
             import traceback
@@ -411,19 +512,14 @@ def interpret_intent(state: AgentState):
             logger.error(f"Fallback to mock parsing due to Bedrock error: {e}")
             new_intent = dict(intent)
     else:
-        # Keyword fallback (no AWS)
+        # Keyword fallback (no AWS, or a bare yes/no answer)
         new_intent = dict(intent)
-        t = transcript.lower()
-        if intent.get("existingCustomer") is None:
-            if any(w in t for w in ["yes", "yeah", "yep", "do", "i am", "i do", "it is"]):
-                new_intent["existingCustomer"] = True
-            elif any(w in t for w in ["no", "nope", "don't", "dont", "not"]):
-                new_intent["existingCustomer"] = False
-        elif intent.get("propertySeen") is None:
-            if any(w in t for w in ["yes", "yeah", "found", "seen", "have"]):
-                new_intent["propertySeen"] = True
-            elif any(w in t for w in ["no", "nope", "not yet", "haven't"]):
-                new_intent["propertySeen"] = False
+        if yes_no is not None:
+            field, yes_re, no_re = yes_no
+            if yes_re.search(transcript):
+                new_intent[field] = True
+            elif no_re.search(transcript):
+                new_intent[field] = False
 
     # ── Address/Postcode Extraction & Validation ─────────────────────────────
     # Check for hard skip fallback (user desperately wants to bypass address validation)
@@ -572,6 +668,98 @@ def interpret_intent(state: AgentState):
     }
 
 
+# ─── Mortgage options dashboard ───────────────────────────────────────────────
+# Static (icons are loaded at import), so built once. Shared across sessions:
+# the component dicts are treated as read-only; only the per-turn payload
+# wrapper is created in render_missing_inputs.
+
+_OPTIONS_MOBILE = [
+    {"id": "root", "component": "Column", "children": ["header", "options_list"]},
+    {"id": "header", "component": "Text", "text": "Barclays Services", "variant": "h2"},
+    {"id": "options_list", "component": "Column", "children": ["opt_ftb", "opt_remortgage", "opt_btl", "opt_moving", "guidance"]},
+
+    {
+        "id": "opt_ftb",
+        "component": "ListItem",
+        "text": "First-time Buyer",
+        "data": {
+            "number": "01",
+            "subtext": "Starting your journey",
+            "rightText": "GUIDE",
+            "url": _FTB_ICON_URL,
+            "action": "select_category",
+            "category": "First-time buyer"
+        }
+    },
+    {
+        "id": "opt_remortgage",
+        "component": "ListItem",
+        "text": "Remortgage",
+        "data": {
+            "number": "02",
+            "subtext": "Switching your deal",
+            "rightText": "SWITCH",
+            "url": _REMORTGAGE_ICON_URL,
+            "action": "select_category",
+            "category": "Remortgage"
+        }
+    },
+    {
+        "id": "opt_btl",
+        "component": "ListItem",
+        "text": "Buy-to-let",
+        "data": {
+            "number": "03",
+            "subtext": "Investment property",
+            "rightText": "INVEST",
+            "url": _BTL_ICON_URL,
+            "action": "select_category",
+            "category": "Buy-to-let"
+        }
+    },
+    {
+        "id": "opt_moving",
+        "component": "ListItem",
+        "text": "Moving Home",
+        "data": {
+            "number": "04",
+            "subtext": "New house, new mortgage",
+            "rightText": "RELOCATE",
+            "url": _MOVING_ICON_URL,
+            "action": "select_category",
+            "category": "Moving home"
+        }
+    },
+    {
+        "id": "guidance",
+        "component": "Text",
+        "text": "Select a mortgage type to get started",
+        "variant": "caption"
+    }
+]
+
+_OPTIONS_DESKTOP = [
+    {"id": "root", "component": "Column", "children": ["header", "options_grid"]},
+    {"id": "header", "component": "Text", "text": "How can we help today?", "variant": "h2"},
+    {"id": "options_grid", "component": "Column", "children": ["row_1", "row_2"]},
+    {"id": "row_1", "component": "Row", "children": ["opt_ftb", "opt_remortgage"]},
+    {"id": "row_2", "component": "Row", "children": ["opt_btl", "opt_moving"]},
+
+    {"id": "opt_ftb", "component": "Column", "children": ["img_ftb", "btn_ftb"]},
+    {"id": "img_ftb", "component": "Image", "data": {"url": _FTB_ICON_URL}, "text": "FTB"},
+    {"id": "btn_ftb", "component": "Button", "text": "First-time buyer", "data": {"action": "select_category", "category": "First-time buyer"}},
+    {"id": "opt_remortgage", "component": "Column", "children": ["img_remortgage", "btn_remortgage"]},
+    {"id": "img_remortgage", "component": "Image", "data": {"url": _REMORTGAGE_ICON_URL}, "text": "Remortgage"},
+    {"id": "btn_remortgage", "component": "Button", "text": "Remortgage", "data": {"action": "select_category", "category": "Remortgage"}},
+    {"id": "opt_btl", "component": "Column", "children": ["img_btl", "btn_btl"]},
+    {"id": "img_btl", "component": "Image", "data": {"url": _BTL_ICON_URL}, "text": "BTL"},
+    {"id": "btn_btl", "component": "Button", "text": "Buy-to-let", "data": {"action": "select_category", "category": "Buy-to-let"}},
+    {"id": "opt_moving", "component": "Column", "children": ["img_moving", "btn_moving"]},
+    {"id": "img_moving", "component": "Image", "data": {"url": _MOVING_ICON_URL}, "text": "Moving"},
+    {"id": "btn_moving", "component": "Button", "text": "Moving home", "data": {"action": "select_category", "category": "Moving home"}}
+]
+
+
 def render_missing_inputs(state: AgentState):
     intent = _intent(state)
     missing = []
@@ -650,11 +838,10 @@ def render_missing_inputs(state: AgentState):
         # Intelligent generation via Nova Lite
         if os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_PROFILE"):
             try:
-                from langchain_aws import ChatBedrockConverse
                 from langchain_core.messages import HumanMessage, SystemMessage
 
                 model_id = os.getenv("AGENT_MODEL_ID", "amazon.nova-lite-v1:0")
-                llm = ChatBedrockConverse(model=model_id, region_name=os.getenv("AWS_REGION", "us-east-1"))
+                llm = _get_llm(model_id, os.getenv("AWS_REGION", "us-east-1"))
 
                 system_prompt = (
                     "You are a professional Barclays Mortgage Assistant. Your goal is to collect "
@@ -787,108 +974,8 @@ def render_missing_inputs(state: AgentState):
     category = intent.get("category")
 
     if not category:
-        try:
-            with open(os.path.join(_ASSETS_DIR, "ftb_b64.txt"), "r") as f: ftb_icon = f.read().strip()
-            with open(os.path.join(_ASSETS_DIR, "remortgage_b64.txt"), "r") as f: remortgage_icon = f.read().strip()
-            with open(os.path.join(_ASSETS_DIR, "btl_b64.txt"), "r") as f: btl_icon = f.read().strip()
-            with open(os.path.join(_ASSETS_DIR, "moving_b64.txt"), "r") as f: moving_icon = f.read().strip()
-            # Default fallback for lost card if no b64 file exists
-            try:
-                with open(os.path.join(_ASSETS_DIR, "lost_card_b64.txt"), "r") as f: lost_card_icon = f.read().strip()
-            except:
-                lost_card_icon = "" 
-        except:
-            ftb_icon = remortgage_icon = btl_icon = moving_icon = lost_card_icon = ""
-
         device = state.get("device", "desktop")
-        
-        if device == "mobile":
-            components = [
-                {"id": "root", "component": "Column", "children": ["header", "options_list"]},
-                {"id": "header", "component": "Text", "text": "Barclays Services", "variant": "h2"},
-                {"id": "options_list", "component": "Column", "children": ["opt_ftb", "opt_remortgage", "opt_btl", "opt_moving", "guidance"]},
-                
-                {
-                    "id": "opt_ftb", 
-                    "component": "ListItem", 
-                    "text": "First-time Buyer", 
-                    "data": {
-                        "number": "01",
-                        "subtext": "Starting your journey",
-                        "rightText": "GUIDE",
-                        "url": f"data:image/png;base64,{ftb_icon}",
-                        "action": "select_category", 
-                        "category": "First-time buyer"
-                    }
-                },
-                {
-                    "id": "opt_remortgage", 
-                    "component": "ListItem", 
-                    "text": "Remortgage", 
-                    "data": {
-                        "number": "02",
-                        "subtext": "Switching your deal",
-                        "rightText": "SWITCH",
-                        "url": f"data:image/png;base64,{remortgage_icon}",
-                        "action": "select_category", 
-                        "category": "Remortgage"
-                    }
-                },
-                {
-                    "id": "opt_btl", 
-                    "component": "ListItem", 
-                    "text": "Buy-to-let", 
-                    "data": {
-                        "number": "03",
-                        "subtext": "Investment property",
-                        "rightText": "INVEST",
-                        "url": f"data:image/png;base64,{btl_icon}",
-                        "action": "select_category", 
-                        "category": "Buy-to-let"
-                    }
-                },
-                {
-                    "id": "opt_moving", 
-                    "component": "ListItem", 
-                    "text": "Moving Home", 
-                    "data": {
-                        "number": "04",
-                        "subtext": "New house, new mortgage",
-                        "rightText": "RELOCATE",
-                        "url": f"data:image/png;base64,{moving_icon}",
-                        "action": "select_category", 
-                        "category": "Moving home"
-                    }
-                },
-                {
-                    "id": "guidance",
-                    "component": "Text",
-                    "text": "Select a mortgage type to get started",
-                    "variant": "caption"
-                }
-            ]
-        else:
-            components = [
-                {"id": "root", "component": "Column", "children": ["header", "options_grid"]},
-                {"id": "header", "component": "Text", "text": "How can we help today?", "variant": "h2"},
-                {"id": "options_grid", "component": "Column", "children": ["row_1", "row_2"]},
-                {"id": "row_1", "component": "Row", "children": ["opt_ftb", "opt_remortgage"]},
-                {"id": "row_2", "component": "Row", "children": ["opt_btl", "opt_moving"]},
-                
-
-                {"id": "opt_ftb", "component": "Column", "children": ["img_ftb", "btn_ftb"]},
-                {"id": "img_ftb", "component": "Image", "data": {"url": f"data:image/png;base64,{ftb_icon}"}, "text": "FTB"},
-                {"id": "btn_ftb", "component": "Button", "text": "First-time buyer", "data": {"action": "select_category", "category": "First-time buyer"}},
-                {"id": "opt_remortgage", "component": "Column", "children": ["img_remortgage", "btn_remortgage"]},
-                {"id": "img_remortgage", "component": "Image", "data": {"url": f"data:image/png;base64,{remortgage_icon}"}, "text": "Remortgage"},
-                {"id": "btn_remortgage", "component": "Button", "text": "Remortgage", "data": {"action": "select_category", "category": "Remortgage"}},
-                {"id": "opt_btl", "component": "Column", "children": ["img_btl", "btn_btl"]},
-                {"id": "img_btl", "component": "Image", "data": {"url": f"data:image/png;base64,{btl_icon}"}, "text": "BTL"},
-                {"id": "btn_btl", "component": "Button", "text": "Buy-to-let", "data": {"action": "select_category", "category": "Buy-to-let"}},
-                {"id": "opt_moving", "component": "Column", "children": ["img_moving", "btn_moving"]},
-                {"id": "img_moving", "component": "Image", "data": {"url": f"data:image/png;base64,{moving_icon}"}, "text": "Moving"},
-                {"id": "btn_moving", "component": "Button", "text": "Moving home", "data": {"action": "select_category", "category": "Moving home"}}
-            ]
+        components = _OPTIONS_MOBILE if device == "mobile" else _OPTIONS_DESKTOP
         payload = {"version": "v0.9", "updateComponents": {"surfaceId": "main", "components": components}}
         new_outbox.append({"type": "server.a2ui.patch", "payload": payload})
         new_outbox.extend(branch_outbox_items)
@@ -933,13 +1020,8 @@ def render_missing_inputs(state: AgentState):
             {"id": "guidance", "component": "Text", "text": "Please confirm if you already bank with us so we can personalize your journey.", "variant": "caption"}
         ]
     else:
-        # Re-using icons or using placeholders for now
+        # Re-using the FTB icon as a placeholder for now
         # Ideally we'd have specific icons for these
-        try:
-            with open(os.path.join(_ASSETS_DIR, "ftb_b64.txt"), "r") as f: icon_b64 = f.read().strip()
-        except:
-            icon_b64 = ""
-
         components = [
             {"id": "root", "component": "Column", "children": ["journey", "header", "details_col"]},
             {"id": "journey", "component": "Timeline", "data": {"steps": ["Intent", "Property", "Quotes", "Summary"], "current": 1}},
@@ -954,7 +1036,7 @@ def render_missing_inputs(state: AgentState):
                 "data": {
                     "subtext": "Property Address",
                     "rightText": "📍",
-                    "url": f"data:image/png;base64,{icon_b64}" if addr_text else None
+                    "url": _FTB_ICON_URL if addr_text else None
                 }
             },
             {
@@ -965,7 +1047,7 @@ def render_missing_inputs(state: AgentState):
                 "data": {
                     "subtext": "Property Value",
                     "rightText": "🏠",
-                    "url": f"data:image/png;base64,{icon_b64}" if pv_text else None
+                    "url": _FTB_ICON_URL if pv_text else None
                 }
             },
             {
@@ -976,7 +1058,7 @@ def render_missing_inputs(state: AgentState):
                 "data": {
                     "subtext": "Annual Income" + (" (Joint)" if intent.get("isJoint") else ""),
                     "rightText": "💰",
-                    "url": f"data:image/png;base64,{icon_b64}" if income_text else None
+                    "url": _FTB_ICON_URL if income_text else None
                 }
             },
             {
@@ -987,7 +1069,7 @@ def render_missing_inputs(state: AgentState):
                 "data": {
                     "subtext": "Loan Balance" if category == "Remortgage" else "Mortgage Amount",
                     "rightText": "🏦",
-                    "url": f"data:image/png;base64,{icon_b64}" if lb_text else None
+                    "url": _FTB_ICON_URL if lb_text else None
                 }
             },
             {
@@ -998,7 +1080,7 @@ def render_missing_inputs(state: AgentState):
                 "data": {
                     "subtext": "Fixed Term",
                     "rightText": "⏳",
-                    "url": f"data:image/png;base64,{icon_b64}" if fy_text else None
+                    "url": _FTB_ICON_URL if fy_text else None
                 }
             }
         ]
@@ -1107,6 +1189,8 @@ def call_mortgage_tools(state: AgentState):
     products = fetch_mortgage_products(ltv, fy or 5)
 
     ty = intent.get("termYears", 25)
+    # Serial on purpose: recalculate_monthly_payment is a few float ops with
+    # no I/O, so a thread pool or gather() would cost more than it saves.
     for p in products:
         calc = recalculate_monthly_payment(lb, p["rate"], ty, p["fee"])
         p.update(calc)
@@ -1116,6 +1200,16 @@ def call_mortgage_tools(state: AgentState):
     return {"domain": state.get("domain", {})}
 
 
+# Fixed parts of the product-comparison components; render_products_a2ui
+# copies these per turn rather than sharing them across sessions.
+_LTV_GAUGE_TMPL = {"id": "ltv_gauge", "component": "Gauge", "max": 100}
+_MARKET_INSIGHT_TMPL = {
+    "id": "market_insight",
+    "component": "ComparisonBadge",
+    "text": "Market Leading: These rates are in the top 5% for your LTV tier",
+}
+
+
 def render_products_a2ui(state: AgentState):
     ltv = _dm_get(state, "ltv", 0)
     products = _dm_get(state, "products", [])
@@ -1136,20 +1230,21 @@ def render_products_a2ui(state: AgentState):
     annual_income = intent.get("annualIncome")
     loan_balance = intent.get("loanBalance")
 
+    root_children = ["journey", "header_text"]
     components = [
-        {"id": "root", "component": "Column", "children": ["journey", "header_text"]}
+        {"id": "root", "component": "Column", "children": root_children}
     ]
     components.append({"id": "journey", "component": "Timeline", "data": {"steps": ["Intent", "Property", "Quotes", "Summary"], "current": 2}})
     components.append({"id": "header_text", "component": "Text", "text": "Your Comparative Analysis", "variant": "h2"})
 
     if ltv > 0:
-        components[0]["children"].append("ltv_gauge")
-        components.append({"id": "ltv_gauge", "component": "Gauge", "value": ltv, "max": 100})
+        root_children.append("ltv_gauge")
+        components.append({**_LTV_GAUGE_TMPL, "value": ltv})
 
     # ── Affordability progress bar ────────────────────────────────────────────
     if annual_income and loan_balance:
         max_affordable = int(annual_income * 4.5)
-        components[0]["children"].append("affordability_bar")
+        root_children.append("affordability_bar")
         components.append({
             "id": "affordability_bar",
             "component": "ProgressBar",
@@ -1161,7 +1256,7 @@ def render_products_a2ui(state: AgentState):
             },
         })
         if loan_balance > max_affordable:
-            components[0]["children"].append("affordability_warning")
+            root_children.append("affordability_warning")
             components.append({
                 "id": "affordability_warning",
                 "component": "BenefitCard",
@@ -1180,7 +1275,7 @@ def render_products_a2ui(state: AgentState):
     if products:
         # Hero stat: best (lowest) monthly payment
         best_monthly = min(p.get("monthlyPayment", 9999) for p in products)
-        components[0]["children"].append("monthly_stat")
+        root_children.append("monthly_stat")
         components.append({
             "id": "monthly_stat",
             "component": "StatCard",
@@ -1191,24 +1286,27 @@ def render_products_a2ui(state: AgentState):
             },
         })
 
-        components[0]["children"].append("market_insight")
-        components.append({"id": "market_insight", "component": "ComparisonBadge", "text": "Market Leading: These rates are in the top 5% for your LTV tier"})
+        root_children.append("market_insight")
+        components.append({**_MARKET_INSIGHT_TMPL})
 
-        components[0]["children"].append("products_row")
-        components.append({"id": "products_row", "component": "Row", "children": [f"prod_{i}" for i in range(len(products))]})
-        for i, p in enumerate(products):
-            components.append({"id": f"prod_{i}", "component": "ProductCard", "data": p})
+        prod_ids = [f"prod_{i}" for i in range(len(products))]
+        root_children.append("products_row")
+        components.append({"id": "products_row", "component": "Row", "children": prod_ids})
+        components.extend(
+            {"id": pid, "component": "ProductCard", "data": p}
+            for pid, p in zip(prod_ids, products)
+        )
 
         # Payment breakdown
         breakdown = [
             {"label": "Capital Repayment", "value": f"\u00a3{int((products[0].get('monthlyPayment', 0)) * 0.4):,} (Est.)"},
             {"label": "Interest Portion", "value": f"\u00a3{int((products[0].get('monthlyPayment', 0)) * 0.6):,} (Est.)"}
         ]
-        components[0]["children"].append("pmt_breakdown")
+        root_children.append("pmt_breakdown")
         components.append({"id": "pmt_breakdown", "component": "DataCard", "data": {"items": breakdown}})
 
         # ── Term slider — lets user drag to recalculate in real time ─────────
-        components[0]["children"].append("term_slider")
+        root_children.append("term_slider")
         components.append({
             "id": "term_slider",
             "component": "Slider",
@@ -1229,7 +1327,7 @@ def render_products_a2ui(state: AgentState):
                     + ". I've marked it on the screen."
                 )
                 new_outbox.append({"type": "server.voice.say", "payload": {"text": branch_msg}})
-                components[0]["children"].extend(["branch_header", "branch_card", "branch_map"])
+                root_children.extend(["branch_header", "branch_card", "branch_map"])
                 components.extend([
                     {"id": "branch_header", "component": "Text", "text": "Nearest Barclays Branch", "variant": "h3"},
                     {
@@ -1268,7 +1366,7 @@ def render_products_a2ui(state: AgentState):
             "text": products_faq_question,
             "data": {"question": products_faq_question, "answer": products_faq_answer},
         })
-        components[0]["children"].append("faq_card")
+        root_children.append("faq_card")
 
     payload = {
         "version": "v0.9",
@@ -1283,11 +1381,10 @@ def render_products_a2ui(state: AgentState):
     msg = ""
     if os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_PROFILE"):
         try:
-            from langchain_aws import ChatBedrockConverse
             from langchain_core.messages import HumanMessage, SystemMessage
 
             model_id = os.getenv("AGENT_MODEL_ID", "amazon.nova-lite-v1:0")
-            llm = ChatBedrockConverse(model=model_id, region_name=os.getenv("AWS_REGION", "us-east-1"))
+            llm = _get_llm(model_id, os.getenv("AWS_REGION", "us-east-1"))
 
             system_prompt = (
                 "You are a professional Barclays Mortgage Assistant. The user has provided their details, "
@@ -1431,6 +1528,8 @@ def render_summary_a2ui(state: AgentState):
     selection = _dm_get(state, "selection", {})
     product_id = selection.get("productId")
     products = _dm_get(state, "products", [])
+    # fetch_mortgage_products returns at most a handful of products, so a
+    # scan beats keeping a parallel id→product index in domain state in sync.
     selected_prod = next((p for p in products if p["id"] == product_id), None)
     chosen = selected_prod or (products[0] if products else {})
     new_outbox = []
@@ -1540,29 +1639,32 @@ def handoff_to_lost_card(state: AgentState):
 
 def _all_required_fields_present(intent: dict) -> bool:
     """True when all fields needed to call mortgage tools are known."""
-    category = intent.get("category")
+    # Runs on every router tick: bind the lookup once and short-circuit.
+    get = intent.get
+    category = get("category")
     if not category:
         return False
     
     # Core numeric fields required for the calculator
     base_calc_ready = (
-        intent.get("propertyValue") is not None
-        and intent.get("annualIncome") is not None
-        and intent.get("loanBalance") is not None
-        and intent.get("fixYears") is not None
+        get("propertyValue") is not None
+        and get("annualIncome") is not None
+        and get("loanBalance") is not None
+        and get("fixYears") is not None
     )
     if not base_calc_ready:
         return False
 
     # Journey context fields
-    if intent.get("existingCustomer") is None:
+    if get("existingCustomer") is None:
         return False
     
     if category != "Remortgage":
-        if intent.get("propertySeen") is None:
+        property_seen = get("propertySeen")
+        if property_seen is None:
             return False
         # If they've seen a property, we really should have the address before showing specific product quotes
-        if intent.get("propertySeen") and not intent.get("address"):
+        if property_seen and not get("address"):
             return False
             
     return True
@@ -1606,8 +1708,8 @@ def start_router(state: AgentState):
     if state.get("transcript"):
         return "interpret_intent"
 
-    intent = _intent(state)
-    if not intent.get("category") or not _all_required_fields_present(intent):
+    # _all_required_fields_present already rejects a missing category.
+    if not _all_required_fields_present(_intent(state)):
         return "render_missing_inputs"
     return "call_mortgage_tools"
 
@@ -1622,6 +1724,10 @@ def intent_router(state: AgentState):
 
 
 # ─── Graph assembly ───────────────────────────────────────────────────────────
+# Nodes stay synchronous: the runtime adapter runs graph.invoke() on its own
+# thread pool, so Bedrock calls here never block the server's event loop, and
+# the plugin contract tests and import smoke test drive the graph with the
+# synchronous invoke(), which cannot run coroutine nodes.
 
 workflow = StateGraph(AgentState)
 
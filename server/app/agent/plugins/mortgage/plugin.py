@@ -23,52 +23,39 @@ class MortgagePlugin(PluginBase):
         from app.agent.plugins.mortgage.graph import app_graph
         return app_graph
 
-    def create_initial_state(self) -> Dict[str, Any]:
-        """
-        Phase 3 state shape: all mortgage-specific data lives under
-        state["domain"]["mortgage"].  CommonState envelope keys are the
-        only top-level keys shared across all plugins.
-        """
-        return {
-            # ── CommonState envelope ──────────────────────────────────────
-            "mode": "text",
-            "device": "desktop",
-            "transcript": "",
-            "messages": [],
-            "ui": {"surfaceId": "main", "state": "LOADING"},
-            "errors": None,
-            "pendingAction": None,
-            "outbox": [],
-            "meta": {},
-            "state_version": self.state_version,
-            # ── Mortgage domain data ──────────────────────────────────────
-            "domain": {
-                "mortgage": {
-                    # Group A
-                    "branch_requested": False,
-                    # Group B
-                    "address_validation_failed": False,
-                    "last_attempted_address": None,
-                    # Group C
-                    "trouble_count": 0,
-                    "show_support": False,
-                    # Group D
-                    "existing_customer": None,
-                    "property_seen": None,
-                    "process_question": None,
-                    # Group E
-                    "intent": {
-                        "propertyValue": None,
-                        "loanBalance": None,
-                        "fixYears": None,
-                        "termYears": 25,
-                    },
-                    "ltv": 0.0,
-                    "products": [],
-                    "selection": {},
+    # Phase 3 state shape: all mortgage-specific data lives under
+    # state["domain"]["mortgage"].  CommonState envelope keys are the
+    # only top-level keys shared across all plugins.
+    _INITIAL_TEMPLATE = {
+        **PluginBase._INITIAL_TEMPLATE,
+        # ── Mortgage domain data ──────────────────────────────────────────
+        "domain": {
+            "mortgage": {
+                # Group A
+                "branch_requested": False,
+                # Group B
+                "address_validation_failed": False,
+                "last_attempted_address": None,
+                # Group C
+                "trouble_count": 0,
+                "show_support": False,
+                # Group D
+                "existing_customer": None,
+                "property_seen": None,
+                "process_question": None,
+                # Group E
+                "intent": {
+                    "propertyValue": None,
+                    "loanBalance": None,
+                    "fixYears": None,
+                    "termYears": 25,
                 },
+                "ltv": 0.0,
+                "products": [],
+                "selection": {},
             },
-        }
+        },
+    }
 
     @property
     def capabilities(self) -> Dict[str, Any]:
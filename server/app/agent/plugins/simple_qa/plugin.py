@@ -19,24 +19,13 @@ class SimpleQaPlugin(PluginBase):
         from app.agent.plugins.simple_qa.graph import app_graph
         return app_graph
 
-    def create_initial_state(self) -> Dict[str, Any]:
-        return {
-            # ── CommonState envelope ──────────────────────────────────────────
-            "mode": "text",
-            "device": "desktop",
-            "transcript": "",
-            "messages": [],
-            "ui": {"surfaceId": "main", "state": "LOADING"},
-            "errors": None,
-            "pendingAction": None,
-            "outbox": [],
-            "meta": {},
-            "state_version": self.state_version,
-            # ── Domain data ───────────────────────────────────────────────────
-            "domain": {
-                "simple_qa": {},
-            },
-        }
+    _INITIAL_TEMPLATE = {
+        **PluginBase._INITIAL_TEMPLATE,
+        # ── Domain data ───────────────────────────────────────────────────────
+        "domain": {
+            "simple_qa": {},
+        },
+    }
 
     @property
     def capabilities(self) -> Dict[str, Any]:
@@ -1,19 +1,23 @@
 import asyncio
+import base64
+import binascii
 import json
 import logging
 import os
 import re
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from .models import WebSocketMessage, ActionPayload
-from .agent.core.registry import get_plugin
+from .agent.core.registry import freeze_registry, get_plugin
 from .agent.core.runtime_adapter import invoke_graph
 from .agent.plugin_loader import load_all_plugins
 from .nova_sonic import NovaSonicSession
@@ -27,6 +31,7 @@ app = FastAPI(title="Barclays Mortgage Assistant")
 
 # Auto-discover and register all plugins found under app.agent.plugins.
 load_all_plugins()
+freeze_registry()
 
 # Admin / import API
 from .admin import router as admin_router  # noqa: E402
@@ -40,6 +45,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Mortgage option icons, decoded once from the base64 assets, for clients that
+# load them by URL (ICON_BASE_URL) rather than inline data: URLs.
+_ASSETS_DIR = os.getenv("ASSETS_DIR", str(Path(__file__).resolve().parents[2]))
+_ICON_NAMES = frozenset({"ftb", "remortgage", "btl", "moving"})
+
+
+@lru_cache(maxsize=len(_ICON_NAMES))
+def _icon_png(name: str) -> bytes:
+    with open(os.path.join(_ASSETS_DIR, f"{name}_b64.txt"), "r") as f:
+        return base64.b64decode(f.read().strip(), validate=True)
+
+
+@app.get("/icons/{name}.png")
+def get_icon(name: str):
+    if name not in _ICON_NAMES:
+        raise HTTPException(status_code=404)
+    try:
+        png = _icon_png(name)
+    except (OSError, binascii.Error):
+        raise HTTPException(status_code=404)
+    return Response(png, media_type="image/png", headers={"Cache-Control": "public, max-age=86400"})
+
+
 sessions: Dict[str, dict] = {}
 
 # Initial state is now owned by each plugin via plugin.create_initial_state().
@@ -9,6 +9,9 @@ logger = logging.getLogger(__name__)
 _SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _STT_SCRIPT = os.path.join(_SERVER_DIR, "nova_sonic_stt.mjs")
 
+# INJECT_ASSISTANT is a line protocol: fold CR/LF to spaces in one translate pass.
+_NEWLINES_TO_SPACES = str.maketrans("\r\n", "  ")
+
 
 class NovaSonicSession:
     def __init__(self, on_audio_chunk, on_text_chunk, on_finished):
@@ -148,7 +151,7 @@ class NovaSonicSession:
         """Inject the agent's response as ASSISTANT context into the Nova Sonic session."""
         if not self.is_active or not self.proc or not self.proc.stdin:
             return
-        safe = text.replace('\n', ' ').replace('\r', ' ').strip()
+        safe = text.translate(_NEWLINES_TO_SPACES).strip()
         if not safe:
             return
         try:
@@ -5,17 +5,20 @@ Covers:
   - langgraph_json: parse(), pick_graph()
   - inspector:      inspect_file(), inspect_graph_entry()
   - generator:      validate_plugin_id(), config_from_inspection(), render()
+  - llm_designer:   _strip_fences(), design() result cache, refine reply checks
 """
 
 from __future__ import annotations
 
 import ast
+import asyncio
+import json
 import textwrap
 from pathlib import Path
 
 import pytest
 
-from app.agent.core.importer import langgraph_json, inspector, generator
+from app.agent.core.importer import langgraph_json, inspector, generator, llm_designer
 from app.agent.core.importer.langgraph_json import (
     LangGraphConfig,
     LangGraphJsonError,
@@ -28,6 +31,7 @@ from app.agent.core.importer.inspector import (
     InspectionResult,
     inspect_file,
     inspect_graph_entry,
+    inspect_many,
 )
 from app.agent.core.importer.generator import (
     GeneratorConfig,
@@ -35,6 +39,7 @@ from app.agent.core.importer.generator import (
     render,
     validate_plugin_id,
 )
+from app.agent.core.importer.llm_designer import _strip_fences
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
@@ -298,6 +303,45 @@ graph = None
         with pytest.raises(InspectionError, match="Syntax error"):
             inspect_file(f)
 
+    def test_nodes_inside_builder_function(self, tmp_path):
+        source = """\
+from typing import TypedDict
+from langgraph.graph import StateGraph
+class State(TypedDict):
+    query: str
+def build():
+    builder = StateGraph(State)
+    builder.add_node("answer", answer)
+    return builder
+graph = build().compile()
+"""
+        f = _write(tmp_path, "agent.py", source)
+        r = inspect_file(f)
+        assert r.compiled_export == "graph"
+        assert [n.name for n in r.nodes] == ["answer"]
+
+    def test_conditional_top_level_node(self, tmp_path):
+        source = """\
+from typing import TypedDict
+from langgraph.graph import StateGraph
+class State(TypedDict):
+    query: str
+builder = StateGraph(State)
+builder.add_node("a", fa)
+if ENABLE_B:
+    builder.add_node("b", fb)
+graph = builder.compile()
+"""
+        f = _write(tmp_path, "agent.py", source)
+        r = inspect_file(f)
+        assert [n.name for n in r.nodes] == ["a", "b"]
+
+    def test_edited_file_is_reparsed(self, tmp_path):
+        f = _write(tmp_path, "agent.py", _SIMPLE_AGENT)
+        assert inspect_file(f).state_class == "AgentState"
+        _write(tmp_path, "agent.py", _SIMPLE_AGENT.replace("AgentState", "RenamedState"))
+        assert inspect_file(f).state_class == "RenamedState"
+
 
 class TestInspectGraphEntry:
     def test_resolves_relative_path(self, tmp_path):
@@ -311,6 +355,12 @@ class TestInspectGraphEntry:
         with pytest.raises(InspectionError, match="not found"):
             inspect_graph_entry(tmp_path, "missing/agent.py")
 
+    def test_inspect_many_preserves_order(self, tmp_path):
+        _write(tmp_path, "a.py", _SIMPLE_AGENT)
+        _write(tmp_path, "b.py", _PYDANTIC_AGENT)
+        results = inspect_many([(tmp_path, "a.py"), (tmp_path, "b.py")], workers=2)
+        assert [r.state_class for r in results] == ["AgentState", "State"]
+
 
 # ── generator ─────────────────────────────────────────────────────────────────
 
@@ -339,6 +389,10 @@ class TestValidatePluginId:
         with pytest.raises(ValueError):
             validate_plugin_id("my agent")
 
+    def test_trailing_newline_not_allowed(self):
+        with pytest.raises(ValueError):
+            validate_plugin_id("my_agent\n")
+
 
 class TestRender:
     def _build_config(self) -> GeneratorConfig:
@@ -399,6 +453,14 @@ graph = None
         # Default screens contain "welcome" key
         assert "welcome" in files["graph.py"]
 
+    def test_initial_domain_state_written_as_python_literal(self):
+        config = self._build_config()
+        config.initial_domain_state = {"answer": None, "done": False, "tags": ["x" * 120]}
+        files = render(config)
+        assert "null" not in files["plugin.py"]
+        assert "False" in files["plugin.py"]
+        ast.parse(files["plugin.py"])
+
     def test_invalid_plugin_id_raises(self):
         config = self._build_config()
         config.plugin_id = "INVALID"
@@ -435,3 +497,58 @@ graph = None
         assert config.plugin_class_name == "QaAgentPlugin"
         # state fields minus skipped ones should be in initial_domain_state
         assert "query" in config.initial_domain_state or "result" in config.initial_domain_state
+
+
+# ── llm_designer ──────────────────────────────────────────────────────────────
+
+class TestStripFences:
+    def test_fenced_json(self):
+        assert _strip_fences('```json\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_bare_fence(self):
+        assert _strip_fences('```\n{"a": 1}\n```\n') == '{"a": 1}'
+
+    def test_unfenced_text_starting_with_fence_letters_is_kept(self):
+        # The old lstrip("```json") chain would have eaten the leading "json".
+        assert _strip_fences("json_value") == "json_value"
+        assert _strip_fences('  {"a": 1}  ') == '{"a": 1}'
+
+
+class TestDesignCache:
+    def test_repeat_design_is_served_from_cache(self, tmp_path, monkeypatch):
+        calls = []
+
+        async def fake_design(plugin_id, inspection, *args):
+            calls.append(plugin_id)
+            return llm_designer.DesignResult(
+                screens={"welcome": {"title": "Hi"}},
+                input_field="messages",
+                output_accessor="messages[-1].content",
+                initial_domain_state={},
+                reasoning="r",
+            )
+
+        monkeypatch.setattr(llm_designer, "_design", fake_design)
+        monkeypatch.setattr(llm_designer, "_design_cache", type(llm_designer._design_cache)())
+        result = inspect_file(_write(tmp_path, "agent.py", _SIMPLE_AGENT))
+
+        first = asyncio.run(llm_designer.design("cached_qa", result, "readme"))
+        second = asyncio.run(llm_designer.design("cached_qa", result, "readme"))
+        asyncio.run(llm_designer.design("cached_qa", result, "other readme"))
+
+        assert calls == ["cached_qa", "cached_qa"]
+        assert second == first
+        assert second.screens is not first.screens
+
+
+class TestRefineReply:
+    def test_reply_missing_a_required_screen_is_rejected(self, monkeypatch):
+        screen = {"title": "T", "voice_text": "v",
+                  "components": [{"id": "root", "component": "Column", "children": []}]}
+        reply = {"screens": {"welcome": screen, "result": screen}, "reasoning": "r"}
+        monkeypatch.setattr(
+            llm_designer, "_invoke_converse",
+            lambda *args, **kwargs: json.dumps(reply),
+        )
+        with pytest.raises(ValueError, match="error"):
+            llm_designer._refine_sync("refine_qa", {}, "make it blue", "", "model")
@@ -0,0 +1,53 @@
+"""
+test_mortgage_intent.py — Mortgage interpret_intent yes/no fast path.
+
+A bare yes/no answer to "Do you already bank with Barclays?" or "Have you
+found a property yet?" is parsed locally, without a Bedrock call, and must
+set the field the question asks about.
+
+Run:
+    cd server && python -m pytest tests/test_mortgage_intent.py -v
+"""
+
+import pytest
+
+from app.agent.plugins.mortgage import graph as mortgage_graph
+from app.agent.plugins.mortgage.plugin import MortgagePlugin
+
+
+BARE_ANSWERS = [
+    ("yes", True),
+    ("yeah", True),
+    ("Yep.", True),
+    ("no", False),
+    ("Nope!", False),
+]
+
+# Intent before the answer → field the pending question fills.
+QUESTIONS = [
+    ({}, "existingCustomer"),
+    ({"existingCustomer": True}, "propertySeen"),
+]
+
+
+@pytest.fixture
+def no_bedrock(monkeypatch):
+    """Pretend AWS is configured, and fail if the intent LLM is reached."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("bare yes/no answer reached Bedrock")
+
+    monkeypatch.setattr(mortgage_graph, "_get_intent_llm", _fail)
+
+
+@pytest.mark.parametrize("known, field", QUESTIONS)
+@pytest.mark.parametrize("answer, expected", BARE_ANSWERS)
+def test_bare_yes_no_sets_pending_field_without_llm(no_bedrock, known, field, answer, expected):
+    state = MortgagePlugin().create_initial_state()
+    state["domain"]["mortgage"]["intent"] = dict(known)
+    state["transcript"] = answer
+
+    result = mortgage_graph.interpret_intent(state)
+
+    assert result["domain"]["mortgage"]["intent"][field] is expected